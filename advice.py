@@ -0,0 +1,195 @@
+"""Table-driven tactical advice evaluated for every player at once."""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from event_store import PITCH_LENGTH, PITCH_WIDTH
+
+# A team "leads" when its xG balance is above this.
+LEAD_BALANCE = 0.5
+
+# Per role, rules are tried in order; the first whose conditions all hold wins and an
+# empty condition list is the fallback. A condition is (feature, op, value[, offset])
+# where value is a number or another feature. Features: x, y, opt_x, opt_y,
+# dy_center (|y - 34|), dy_target (|y - opt_y|), left (1 for the left-side team), rand.
+# Coordinates are in the player's attacking frame (own goal at x = 0) whichever side the
+# team is drawn on; messages show the drawn coordinates.
+# Each rule carries its message when the team leads and when it does not.
+ADVICE_RULES = {
+    'FWD': [
+        ('charge', [('x', '<', 'opt_x', -10)],
+         "Charge to ({opt_x:.1f}, {opt_y:.1f}). Lead (xG balance {balance:.2f})—exploit gaps with speed.",
+         "Advance to ({opt_x:.1f}, {opt_y:.1f}). Close (xG balance {balance:.2f})—seek openings."),
+        ('centre', [('dy_center', '>', 15)],
+         "Move centrally to ({opt_x:.1f}, {opt_y:.1f}). Edge (xG balance {balance:.2f})—aim for goal.",
+         "Drift to ({opt_x:.1f}, {opt_y:.1f}). Tight (xG balance {balance:.2f})—use wide gaps."),
+        ('hold', [('x', '>', 85)],
+         "Stay at ({opt_x:.1f}, {opt_y:.1f}). Advantage (xG balance {balance:.2f})—lure defenders.",
+         "Hold at ({opt_x:.1f}, {opt_y:.1f}). Even (xG balance {balance:.2f})—wait for counter."),
+        ('link', [('rand', '<', 0.3)],
+         "Drop from ({x:.1f}, {y:.1f}) to link. Lead (xG balance {balance:.2f})—create space.",
+         "Support from ({x:.1f}, {y:.1f}). Close (xG balance {balance:.2f})—aid midfield."),
+        ('attack', [],
+         "Attack ({opt_x:.1f}, {opt_y:.1f}). Dominance (xG balance {balance:.2f})—score in box.",
+         "Move to ({opt_x:.1f}, {opt_y:.1f}). Tight (xG balance {balance:.2f})—strike smartly."),
+    ],
+    'DEF': [
+        ('press', [('x', '>', 'opt_x', 10)],
+         "Press to ({opt_x:.1f}, {opt_y:.1f}). Lead (xG balance {balance:.2f})—mark forwards.",
+         "Retreat to ({opt_x:.1f}, {opt_y:.1f}). Tight (xG balance {balance:.2f})—stay tight."),
+        ('cover', [('dy_target', '>', 10)],
+         "Cover ({opt_x:.1f}, {opt_y:.1f}). Edge (xG balance {balance:.2f})—block wings.",
+         "Adjust to ({opt_x:.1f}, {opt_y:.1f}). Close (xG balance {balance:.2f})—watch wingers."),
+        ('deep', [('x', '<', 20)],
+         "Hold at ({x:.1f}, {y:.1f}). Advantage (xG balance {balance:.2f})—stop counters.",
+         "Guard at ({x:.1f}, {y:.1f}). Even (xG balance {balance:.2f})—protect box."),
+        ('intercept', [('rand', '<', 0.3)],
+         "Intercept from ({x:.1f}, {y:.1f}). Lead (xG balance {balance:.2f})—break play.",
+         "Hold at ({x:.1f}, {y:.1f}). Tight (xG balance {balance:.2f})—track runners."),
+        ('lock', [],
+         "Lock ({opt_x:.1f}, {opt_y:.1f}). Dominance (xG balance {balance:.2f})—secure danger area.",
+         "Defend ({opt_x:.1f}, {opt_y:.1f}). Close (xG balance {balance:.2f})—block shots."),
+    ],
+    'MID': [
+        ('push', [('x', '<', 40)],
+         "Advance to ({opt_x:.1f}, {opt_y:.1f}). Lead (xG balance {balance:.2f})—push play.",
+         "Push to ({opt_x:.1f}, {opt_y:.1f}). Tight (xG balance {balance:.2f})—link play."),
+        ('flank', [('dy_center', '>', 20)],
+         "Move to ({opt_x:.1f}, {opt_y:.1f}). Edge (xG balance {balance:.2f})—use flanks.",
+         "Cover ({opt_x:.1f}, {opt_y:.1f}). Close (xG balance {balance:.2f})—shield flanks."),
+        ('support', [('x', '>', 70)],
+         "Support at ({opt_x:.1f}, {opt_y:.1f}). Lead (xG balance {balance:.2f})—feed attackers.",
+         "Hold at ({opt_x:.1f}, {opt_y:.1f}). Even (xG balance {balance:.2f})—aid counters."),
+        ('recycle', [('rand', '<', 0.3)],
+         "Recycle from ({x:.1f}, {y:.1f}). Advantage (xG balance {balance:.2f})—keep ball.",
+         "Stay at ({x:.1f}, {y:.1f}). Tight (xG balance {balance:.2f})—disrupt press."),
+        ('control', [],
+         "Control ({opt_x:.1f}, {opt_y:.1f}). Dominance (xG balance {balance:.2f})—break lines.",
+         "Balance ({opt_x:.1f}, {opt_y:.1f}). Close (xG balance {balance:.2f})—maintain shape."),
+    ],
+    'GK': [
+        ('off_line_left', [('x', '>', 10), ('left', '==', 1)],
+         "Move to ({opt_x:.1f}, {opt_y:.1f}). Lead (xG balance {balance:.2f})—distribute boldly.",
+         "Stay at ({opt_x:.1f}, {opt_y:.1f}). Tight (xG balance {balance:.2f})—be ready."),
+        ('off_line_right', [('x', '>', 10), ('left', '==', 0)],
+         "Shift to ({opt_x:.1f}, {opt_y:.1f}). Edge (xG balance {balance:.2f})—launch attacks.",
+         "Move to ({opt_x:.1f}, {opt_y:.1f}). Close (xG balance {balance:.2f})—watch shots."),
+        ('angle', [('dy_center', '>', 5)],
+         "Adjust to ({opt_x:.1f}, {opt_y:.1f}). Lead (xG balance {balance:.2f})—cover angles.",
+         "Shift to ({opt_x:.1f}, {opt_y:.1f}). Even (xG balance {balance:.2f})—guard crosses."),
+        ('organize', [('rand', '<', 0.3)],
+         "Organize from ({x:.1f}, {y:.1f}). Advantage (xG balance {balance:.2f})—lead defense.",
+         "Hold at ({x:.1f}, {y:.1f}). Tight (xG balance {balance:.2f})—organize backline."),
+        ('command', [],
+         "Command ({opt_x:.1f}, {opt_y:.1f}). Dominance (xG balance {balance:.2f})—pass accurately.",
+         "Protect ({opt_x:.1f}, {opt_y:.1f}). Close (xG balance {balance:.2f})—make saves."),
+    ],
+}
+
+# Personal tip from the player's match stats so far (see player_stats.METRICS):
+# first (metric, threshold) exceeded wins.
+TIP_RULES = [
+    ('goals', 0, "Your scoring form is hot—take more shots and challenge the keeper."),
+    ('assists', 0, "Your playmaking shines—find teammates with precise passes."),
+    ('passes_completed', 40, "You control the game—dictate tempo with sharp passing."),
+    ('xg', 0.5, "You’re a star—lead the team and make the difference."),
+]
+DEFAULT_TIP = "Stay focused—work with teammates to shift momentum."
+
+_OPS = {'<': np.less, '>': np.greater, '==': np.equal}
+
+# Flat rule list; an advice code is an index into it.
+RULES = [(role, name, conditions, lead, tight)
+         for role, rules in ADVICE_RULES.items() for name, conditions, lead, tight in rules]
+
+
+def player_tip(stats):
+    for metric, threshold, tip in TIP_RULES:
+        if stats.get(metric, 0) > threshold:
+            return tip
+    return DEFAULT_TIP
+
+
+class AdviceEngine:
+    """Evaluates ADVICE_RULES for all players of a match in one vectorised pass per step."""
+
+    def __init__(self, match, cache_steps=256, seed=0):
+        self.match = match
+        self.seed = seed
+        self.cache_steps = cache_steps
+        self._cache = OrderedDict()
+        # Ticks and the frame prefetcher evaluate steps from different threads.
+        self._lock = threading.Lock()
+        names = match.player_names
+        self.index_of = {name: i for i, name in enumerate(names)}
+        roles = [match.player_roles[name] for name in names]
+        teams = [match.player_team[name] for name in names]
+        balance_by_team = dict(zip(match.team_stats['Squad'], match.team_stats['xG_balance']))
+
+        self.targets = np.array([match.role_targets[(team, role)] for team, role in zip(teams, roles)], dtype=float)
+        self.left = np.array([match.sides[team] == 'left' for team in teams], dtype=float)
+        self.balance = np.array([balance_by_team[team] for team in teams], dtype=float)
+        self.lead = self.balance > LEAD_BALANCE
+        # Rule indices per role, so each role's rows are evaluated with one np.select.
+        self.role_rows = {role: np.array([i for i, r in enumerate(roles) if r == role], dtype=int)
+                          for role in ADVICE_RULES}
+        self.role_rules = {role: [i for i, rule in enumerate(RULES) if rule[0] == role] for role in ADVICE_RULES}
+
+    def _features(self, step, frame):
+        right = self.left == 0
+        x = np.where(right, PITCH_LENGTH - frame[:, 0], frame[:, 0])
+        y = np.where(right, PITCH_WIDTH - frame[:, 1], frame[:, 1])
+        opt_x = np.where(right, PITCH_LENGTH - self.targets[:, 0], self.targets[:, 0])
+        opt_y = np.where(right, PITCH_WIDTH - self.targets[:, 1], self.targets[:, 1])
+        rand = np.random.default_rng((self.seed, self.match.match_id, step)).random(len(frame))
+        return {'x': x, 'y': y, 'opt_x': opt_x, 'opt_y': opt_y, 'dy_center': np.abs(y - 34),
+                'dy_target': np.abs(y - opt_y), 'left': self.left, 'rand': rand}
+
+    def evaluate(self, step):
+        """Return (advice codes, target points) for every player at ``step``, cached by step."""
+        with self._lock:
+            cached = self._cache.get(step)
+            if cached is not None:
+                self._cache.move_to_end(step)
+                return cached
+        frame = self.match.frame_at(step)
+        features = self._features(step, frame)
+        codes = np.zeros(len(frame), dtype=np.int16)
+        for role, rows in self.role_rows.items():
+            if not len(rows):
+                continue
+            rule_ids = self.role_rules[role]
+            condlist = []
+            for rule_id in rule_ids:
+                mask = np.ones(len(rows), dtype=bool)
+                for condition in RULES[rule_id][2]:
+                    feature, op, value = condition[:3]
+                    offset = condition[3] if len(condition) > 3 else 0
+                    rhs = features[value][rows] if isinstance(value, str) else value
+                    mask &= _OPS[op](features[feature][rows], rhs + offset)
+                condlist.append(mask)
+            codes[rows] = np.select(condlist, rule_ids, default=rule_ids[-1])
+        result = (codes, self.targets)
+        with self._lock:
+            self._cache[step] = result
+            if len(self._cache) > self.cache_steps:
+                self._cache.popitem(last=False)
+        return result
+
+    def advice(self, step, player_name):
+        """Return (message, (opt_x, opt_y)) for one player, formatted from the cached batch."""
+        i = self.index_of[player_name]
+        codes, targets = self.evaluate(step)
+        x, y = self.match.frame_at(step)[i].tolist()
+        opt_x, opt_y = targets[i].tolist()
+        _, _, _, lead, tight = RULES[codes[i]]
+        template = lead if self.lead[i] else tight
+        message = template.format(x=x, y=y, opt_x=opt_x, opt_y=opt_y, balance=self.balance[i])
+        tip = player_tip(self.match.player_stats.as_of(step, player_name))
+        return f"{message} {tip}", (opt_x, opt_y)
+
+    def nbytes(self):
+        with self._lock:
+            cached = sum(codes.nbytes for codes, _ in self._cache.values())
+        return cached + self.targets.nbytes + self.left.nbytes + self.balance.nbytes
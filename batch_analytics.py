@@ -0,0 +1,109 @@
+"""Batch analytics for a whole competition season, one match per worker process.
+
+Usage:
+    python batch_analytics.py --competition 43 --season 106 --out analytics/ [--workers N]
+    python batch_analytics.py --cached --out analytics/
+    python batch_analytics.py 3869685 3857256 --out analytics/
+
+Writes Parquet tables across all matches (matches, teams, players, shots) and one
+<match_id>/replay.parquet per match. Point FIDASH_ANALYTICS_DIR at the output and the
+dashboard reuses those replays instead of simulating them again.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from event_store import SHOOTOUT_PERIOD
+from match_cache import cached_matches, competition_matches, load_match
+from match_registry import MatchData
+from replay import replay_frame
+from xg_model import DEFAULT_MODEL_PATH, load_model
+
+
+def analyse_match(match_id, out_dir, model_path=DEFAULT_MODEL_PATH):
+    """Build one match and return its (matches, teams, players, shots) rows; writes its replay."""
+    match = MatchData(match_id, *load_match(match_id), xg_model=load_model(model_path))
+    os.makedirs(os.path.join(out_dir, str(match_id)), exist_ok=True)
+    replay_frame(match.replay_positions, match.player_names).to_parquet(
+        os.path.join(out_dir, str(match_id), 'replay.parquet'), index=False)
+
+    teams = match.team_stats.assign(match_id=match_id)
+    # Shoot-out kicks decide the winner but are not goals (team xG already leaves them out).
+    match_shots = match.shot_data[match.shot_data['period'] != SHOOTOUT_PERIOD]
+    goals = {team: int(((match_shots['team'] == team) & (match_shots['is_goal'] == 1)).sum())
+             for team in match.teams}
+    teams['Goals'] = teams['Squad'].map(goals)
+
+    final = len(match.replay_positions) - 1
+    players = pd.DataFrame([
+        dict(match_id=match_id, player=name, team=match.roster[name][0], role=match.roster[name][1],
+             **match.player_stats.as_of(final, name))
+        for name in match.player_stats.player_names])
+
+    shots = match.shot_data.assign(
+        match_id=match_id,
+        player=match.shot_data['player_id'].map(match.id_to_player),
+        minute=match.events.loc[match.shot_data.index, 'minute'].to_numpy(),
+        second=match.events.loc[match.shot_data.index, 'second'].to_numpy())
+    shots['team'] = shots['team'].astype(str)
+
+    summary = {'match_id': match_id, 'title': match.title, 'events': len(match.events), 'shots': len(shots)}
+    for side, (_, row) in zip(('home', 'away'), teams.iterrows()):
+        summary.update({side: row['Squad'], f'{side}_goals': row['Goals'], f'{side}_xg': row['Attack_xG']})
+    return pd.DataFrame([summary]), teams, players, shots
+
+
+def run(match_ids, out_dir, workers=None, model_path=DEFAULT_MODEL_PATH):
+    """Analyse every match across ``workers`` processes and write the combined tables."""
+    os.makedirs(out_dir, exist_ok=True)
+    tables = {'matches': [], 'teams': [], 'players': [], 'shots': []}
+    failures = {}
+    workers = min(workers or os.cpu_count() or 1, len(match_ids)) or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyse_match, match_id, out_dir, model_path): match_id for match_id in match_ids}
+        for done, future in enumerate(as_completed(futures), 1):
+            match_id = futures[future]
+            try:
+                for name, frame in zip(tables, future.result()):
+                    tables[name].append(frame)
+            except Exception as exc:  # keep going; one bad match should not sink the season
+                failures[match_id] = f"{type(exc).__name__}: {exc}"
+            print(f"[{done}/{len(match_ids)}] {match_id}{' FAILED ' + failures[match_id] if match_id in failures else ''}")
+    for name, frames in tables.items():
+        if frames:
+            combined = pd.concat(frames, ignore_index=True).sort_values('match_id', kind='stable')
+            combined.to_parquet(os.path.join(out_dir, f'{name}.parquet'), index=False)
+    return failures
+
+
+VALUE_OPTIONS = ('--out', '--workers', '--competition', '--season')
+
+
+def main(argv):
+    def option(name, default=None):
+        return argv[argv.index(name) + 1] if name in argv else default
+
+    out_dir = option('--out', 'analytics')
+    workers = int(option('--workers')) if '--workers' in argv else None
+    if '--competition' in argv:
+        match_ids = competition_matches(int(option('--competition')), int(option('--season')))
+    elif '--cached' in argv:
+        match_ids = sorted(cached_matches())
+    else:
+        match_ids = [int(a) for i, a in enumerate(argv)
+                     if not a.startswith('--') and (i == 0 or argv[i - 1] not in VALUE_OPTIONS)]
+    if not match_ids:
+        sys.exit(__doc__)
+
+    start = time.perf_counter()
+    failures = run(match_ids, out_dir, workers)
+    print(f"{len(match_ids) - len(failures)}/{len(match_ids)} matches -> {out_dir} "
+          f"in {time.perf_counter() - start:.1f} s")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,280 @@
+"""Reproducible benchmarks on synthetic StatsBomb data: startup, callback latency, payload size, memory.
+
+Usage:
+    python benchmark.py                          # print results
+    python benchmark.py --save bench.json        # keep results as a baseline
+    python benchmark.py --baseline bench.json    # exit 1 if anything regressed
+
+No network is used: a synthetic match in StatsBomb open-data layout is written to a
+temporary fixture directory and the app runs in offline mode against it.
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_MATCH_ID = 1
+BENCH_EVENTS = 3500
+BENCH_SEED = 7
+
+# Allowed slowdown before a metric counts as a regression (timings are noisy, sizes are not).
+TIME_TOLERANCE = 0.25
+SIZE_TOLERANCE = 0.05
+# Tail latencies swing more between runs; flag them only when they double.
+P95_TOLERANCE = 1.0
+# Timing differences below this many milliseconds are never reported, whatever the ratio.
+TIME_NOISE_FLOOR_MS = 0.05
+# Calls per sample for sub-millisecond timers, so one sample is not a handful of clock ticks.
+FAST_BATCH = 20
+# Fresh interpreters started for the start-up timings; the fastest run is kept.
+STARTUP_RUNS = 3
+
+POSITION_IDS = [1, 2, 3, 5, 6, 13, 10, 15, 17, 23, 21]
+
+
+# -------------------------
+# Synthetic data
+# -------------------------
+def write_synthetic_match(root, match_id=BENCH_MATCH_ID, n_events=BENCH_EVENTS, seed=BENCH_SEED,
+                          grouped_by_type=False):
+    """Write events/<id>.json and lineups/<id>.json shaped like StatsBomb open data.
+
+    ``grouped_by_type`` orders the events by type, as statsbombpy returns them, instead
+    of in match order.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(root, 'events'), exist_ok=True)
+    os.makedirs(os.path.join(root, 'lineups'), exist_ok=True)
+
+    teams = [(1, 'Home FC'), (2, 'Away FC')]
+    lineups, starters = [], {}
+    player_id = 100
+    for team_id, team_name in teams:
+        lineup = []
+        for i in range(16):
+            player_id += 1
+            positions = [] if i >= 11 else [{
+                'position_id': POSITION_IDS[i], 'position': '', 'from': '00:00', 'to': None,
+                'from_period': 1, 'to_period': None, 'start_reason': 'Starting XI', 'end_reason': 'Final Whistle'}]
+            lineup.append({'player_id': player_id, 'player_name': f'{team_name} Player {i + 1}',
+                           'player_nickname': None, 'jersey_number': i + 1,
+                           'country': {'id': team_id, 'name': team_name}, 'cards': [], 'positions': positions})
+            if i < 11:
+                starters.setdefault(team_id, []).append((player_id, f'{team_name} Player {i + 1}'))
+        lineups.append({'team_id': team_id, 'team_name': team_name, 'lineup': lineup})
+
+    event_types = ['Pass'] * 8 + ['Ball Receipt*'] * 6 + ['Carry'] * 5 + ['Pressure'] * 2 + ['Shot']
+    events = []
+    for i in range(n_events):
+        team_id, team_name = rng.choice(teams)
+        player = rng.choice(starters[team_id])
+        kind = rng.choice(event_types)
+        elapsed = i * 120 * 60 // n_events
+        minute = elapsed // 60
+        period = 1 if minute < 45 else 2 if minute < 90 else 3 if minute < 105 else 4
+        event = {'id': f'{match_id}-{i}', 'index': i + 1, 'period': period, 'minute': minute,
+                 'second': elapsed % 60, 'timestamp': '00:00:00.000', 'type': {'id': 0, 'name': kind},
+                 'possession': i // 8, 'possession_team': {'id': team_id, 'name': team_name},
+                 'play_pattern': {'id': 1, 'name': 'Regular Play'}, 'team': {'id': team_id, 'name': team_name},
+                 'player': {'id': player[0], 'name': player[1]}, 'position': {'id': 0, 'name': ''},
+                 'location': [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)]}
+        if kind == 'Pass':
+            recipient = rng.choice(starters[team_id])
+            event['pass'] = {'recipient': {'id': recipient[0], 'name': recipient[1]},
+                             'end_location': [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)]}
+            if rng.random() < 0.2:
+                event['pass']['outcome'] = {'id': 9, 'name': 'Incomplete'}
+        elif kind == 'Shot':
+            event['location'] = [round(rng.uniform(88, 118), 1), round(rng.uniform(22, 58), 1)]
+            outcome = 'Goal' if rng.random() < 0.12 else rng.choice(['Saved', 'Off T', 'Blocked'])
+            event['shot'] = {'outcome': {'id': 0, 'name': outcome}, 'statsbomb_xg': 0.1,
+                             'end_location': [120, 40, 1.0]}
+        events.append(event)
+    if grouped_by_type:
+        events.sort(key=lambda event: event['type']['name'])
+
+    with open(os.path.join(root, 'events', f'{match_id}.json'), 'w') as f:
+        json.dump(events, f)
+    with open(os.path.join(root, 'lineups', f'{match_id}.json'), 'w') as f:
+        json.dump(lineups, f)
+
+
+# -------------------------
+# Measurements
+# -------------------------
+def _timed(fn, repeat, batch=1):
+    """Fastest and 95th percentile wall time of ``fn`` in milliseconds.
+
+    The fastest of ``repeat`` samples is the steadiest figure on a busy machine. Each sample
+    averages ``batch`` calls; ``fn`` gets a distinct call number each time.
+    """
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(i * batch, (i + 1) * batch):
+            fn(j)
+        samples.append((time.perf_counter() - start) * 1000 / batch)
+    samples.sort()
+    return samples[0], samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+def measure_import(env):
+    """(import, create_app) times of the app module in a fresh interpreter, in milliseconds."""
+    code = ("import time; t = time.perf_counter(); import FIDashBoard; i = time.perf_counter(); "
+            "FIDashBoard.create_app(warm_up=False); c = time.perf_counter(); "
+            "print((i - t) * 1000, (c - i) * 1000)")
+    out = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    import_ms, create_ms = out.stdout.strip().splitlines()[-1].split()
+    return float(import_ms), float(create_ms)
+
+
+def measure_first_layout(env):
+    """Time to serve the first page layout in a fresh app without warm-up, in milliseconds."""
+    code = ("import time, FIDashBoard; c = FIDashBoard.create_app(warm_up=False).server.test_client(); "
+            "t = time.perf_counter(); c.get('/_dash-layout'); print((time.perf_counter() - t) * 1000)")
+    out = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def run_in_process(repeat, grouped_dir):
+    import FIDashBoard
+    FIDashBoard.create_app(warm_up=False)
+    import dashboard as app
+    from match_registry import MatchData
+    from pitch_control import control_surface
+    from pitch_figure import frame_patch, payload_bytes
+    from match_cache import load_fixture
+    from spatial_index import EventIndex
+    import numpy as np
+
+    results = {}
+    # Load through the registry first so one-off imports (sklearn for the fallback model) are not timed.
+    match = app.registry.get(BENCH_MATCH_ID)
+    events, lineups = app.registry.loader(BENCH_MATCH_ID)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    match = MatchData(BENCH_MATCH_ID, events, lineups, xg_model=app.registry.xg_model)
+    results['match_build_ms'] = (time.perf_counter() - start) * 1000
+    results['match_build_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    results['match_resident_mb'] = match.nbytes() / 2 ** 20
+
+    # The same match with its events grouped by type must build the same replay, clock and stats.
+    grouped = MatchData(BENCH_MATCH_ID, *load_fixture(BENCH_MATCH_ID, grouped_dir),
+                        xg_model=app.registry.xg_model)
+    if not (np.array_equal(grouped.replay_positions, match.replay_positions)
+            and grouped.timeline.bounds == match.timeline.bounds and grouped.key_events == match.key_events
+            and np.array_equal(grouped.player_stats.totals, match.player_stats.totals)):
+        raise RuntimeError("Events grouped by type built a different match than events in match order")
+
+    player = match.player_names[9]
+    click = {'points': [{'customdata': player}]}
+    n_steps = len(match.replay_positions)
+
+    results['replay_lookup_ms'], _ = _timed(lambda i: match.locations_at(i * 7 % n_steps), repeat * 10, FAST_BATCH)
+    results['seek_ms'], results['seek_p95_ms'] = _timed(
+        lambda i: match.frame_at(match.timeline.seek(i * 37 % 120)), repeat * 10, FAST_BATCH)
+    results['advice_all_players_ms'], _ = _timed(
+        lambda i: app.advice_engine(match).evaluate(n_steps + i), repeat, FAST_BATCH)
+    results['pitch_control_step_ms'], _ = _timed(
+        lambda i: control_surface(match.frame_at(i)[None], app.pitch_control(match).left), repeat)
+    results['event_index_build_ms'], _ = _timed(lambda i: EventIndex.for_match(match), repeat)
+    # Final-third boxes and lassos, over one match and over the events of 50 copies of it.
+    many = EventIndex.for_matches([match] * 50)
+    for label, index in (('region_query_ms', EventIndex.for_match(match)), ('region_query_50_matches_ms', many)):
+        results[label], _ = _timed(lambda i: index.rect(70, 105, i % 40, i % 40 + 28), repeat, FAST_BATCH)
+    results['lasso_query_50_matches_ms'], _ = _timed(
+        lambda i: many.lasso([70, 105, 105, 88], [10 + i % 20, 10, 60, 50]), repeat)
+    results['generate_pitch_visual_ms'], _ = _timed(
+        lambda i: app.generate_pitch_visual(match, i, player), repeat)
+
+    session_id = 'benchmark'
+    app.update_field(BENCH_MATCH_ID, session_id, 0)
+    # End to end: callback plus JSON serialization of its response, as Dash sends it.
+    results['refresh_field_ms'], results['refresh_field_p95_ms'] = _timed(
+        lambda i: payload_bytes(app.update_field(BENCH_MATCH_ID, session_id, i + 1, None, click)), repeat)
+    results['show_player_insights_ms'], _ = _timed(
+        lambda i: payload_bytes([c.to_plotly_json() for c in app.show_player_insights(click, BENCH_MATCH_ID, session_id)]),
+        repeat)
+
+    full = [payload_bytes(app.generate_pitch_visual(match, i, player)) for i in range(20)]
+    patch = [payload_bytes(frame_patch(match.frame_at(i), *app.advice_lines(match, i, player))) for i in range(20)]
+    results['full_figure_bytes'] = sum(full) / len(full)
+    results['patch_bytes'] = sum(patch) / len(patch)
+    control = [payload_bytes(frame_patch(match.frame_at(i), control=app.pitch_control(match).surface(i)))
+               for i in range(20)]
+    results['control_patch_bytes'] = sum(control) / len(control)
+    results['max_tick_rate_hz'] = 1000 / max(results['refresh_field_p95_ms'], 1e-6)
+    return results
+
+
+def compare(results, baseline):
+    """Return a list of regression messages against a saved baseline."""
+    failures = []
+    for name, old in baseline.items():
+        new = results.get(name)
+        if new is None or name == 'max_tick_rate_hz':
+            continue
+        is_size = name.endswith(('_bytes', '_mb'))
+        tolerance = SIZE_TOLERANCE if is_size else P95_TOLERANCE if name.endswith('_p95_ms') else TIME_TOLERANCE
+        if not is_size and new - old < TIME_NOISE_FLOOR_MS:
+            continue
+        if old > 0 and new > old * (1 + tolerance):
+            failures.append(f"{name}: {new:.3f} vs baseline {old:.3f} (+{(new / old - 1) * 100:.0f}%)")
+    return failures
+
+
+def main(argv):
+    repeat = int(argv[argv.index('--repeat') + 1]) if '--repeat' in argv else 50
+    save = argv[argv.index('--save') + 1] if '--save' in argv else None
+    baseline = argv[argv.index('--baseline') + 1] if '--baseline' in argv else None
+
+    # Fixtures, cache and model path live in a temporary directory removed after the run.
+    with tempfile.TemporaryDirectory(prefix='fidash-bench-') as workdir:
+        fixtures = os.path.join(workdir, 'fixtures')
+        write_synthetic_match(fixtures)
+        grouped = os.path.join(workdir, 'grouped')
+        write_synthetic_match(grouped, grouped_by_type=True)
+        os.environ.update({
+            'FIDASH_OFFLINE': '1',
+            'FIDASH_FIXTURE_DIR': fixtures,
+            'FIDASH_CACHE_DIR': os.path.join(workdir, 'cache'),
+            'FIDASH_DEFAULT_MATCH': str(BENCH_MATCH_ID),
+            'FIDASH_MATCH_IDS': str(BENCH_MATCH_ID),
+            'FIDASH_XG_MODEL': os.path.join(workdir, 'no-model.json'),
+        })
+
+        results = {}
+        startup = [measure_import(dict(os.environ)) for _ in range(STARTUP_RUNS)]
+        results['import_ms'] = min(import_ms for import_ms, _ in startup)
+        results['create_app_ms'] = min(create_ms for _, create_ms in startup)
+        # The first page load after start-up pays for building the match (from fixtures, then the cache).
+        results['first_layout_cold_cache_ms'] = measure_first_layout(dict(os.environ))
+        results['first_layout_warm_cache_ms'] = measure_first_layout(dict(os.environ))
+        results.update(run_in_process(repeat, grouped))
+
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:12.3f}")
+
+    if save:
+        with open(save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if baseline:
+        with open(baseline) as f:
+            failures = compare(results, json.load(f))
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,522 @@
+"""The Dash UI: layout, figures and callbacks. Imported by FIDashBoard.create_app(), not at import time."""
+import dash
+from dash import dcc, html, Input, Output, State, ALL, callback, ctx
+import plotly.graph_objs as go
+import numpy as np
+import os
+import threading
+import uuid
+from match_registry import DEFAULT_MATCH_ID, MatchRegistry
+from session_store import make_session_store
+from pitch_figure import SIDE_COLORS, Patch, base_figure, control_trace, frame_patch, player_colors
+from pitch_control import GRID_X, GRID_Y, PitchControl
+from advice import AdviceEngine
+from live_feed import LiveMatch, start_feed
+from prefetch import FramePrefetcher, LRUCache
+from spatial_index import EventIndex
+import metrics
+
+# Constants
+PITCH_LENGTH = 105
+PITCH_WIDTH = 68
+
+# -------------------------
+# Match Data
+# -------------------------
+# Matches load on first request (cache, then fixtures, then StatsBomb) and are evicted
+# least-recently-used once FIDASH_MATCH_MEMORY_MB is exceeded.
+registry = MatchRegistry()
+
+# Replay state (match, step, selected player) per browser session
+session_store = make_session_store()
+
+# Live mode (FIDASH_LIVE_FEED=file:PATH or tcp:HOST:PORT): xG and balance update as events arrive.
+LIVE_FEED = os.environ.get('FIDASH_LIVE_FEED')
+live_match = LiveMatch(registry.xg_model) if LIVE_FEED else None
+
+# Set once the background warm-up has loaded the default match (or failed; see warm_up_error).
+ready = threading.Event()
+warm_up_error = None
+
+# Worker processes used to precompute the default match's pitch control during warm-up
+# (unset: surfaces are computed per step when the overlay is on, ~1 ms each).
+CONTROL_WORKERS = os.environ.get('FIDASH_PITCH_CONTROL_WORKERS')
+
+# -------------------------
+# Utility Functions
+# -------------------------
+def advice_engine(match):
+    """Advice engine for a match, built on first use and kept alongside it."""
+    engine = getattr(match, 'advice_engine', None)
+    if engine is None:
+        engine = match.advice_engine = AdviceEngine(match)
+    return engine
+
+def pitch_control(match):
+    """Pitch control surfaces for a match, built on first use and kept alongside it."""
+    control = getattr(match, 'pitch_control', None)
+    if control is None:
+        control = match.pitch_control = PitchControl(match)
+    return control
+
+def event_index(match):
+    """Spatial index of a match's events, built on first use and kept alongside it."""
+    index = getattr(match, 'event_index', None)
+    if index is None:
+        index = match.event_index = EventIndex.for_match(match)
+    return index
+
+def control_at(match, step, overlay):
+    return pitch_control(match).surface(step) if 'control' in overlay else None
+
+def tactical_advice(match, player_name, step):
+    """Provide tactical advice and optimal positioning based on role and team stats."""
+    return advice_engine(match).advice(step, player_name)
+
+def advice_lines(match, step, selected_player=None, show_all=False):
+    """Return x and y lists of dashed player-to-target lines, separated by None."""
+    if show_all:
+        rows = np.arange(len(match.player_names))
+    elif selected_player in match.player_roles:
+        rows = np.array([match.player_names.index(selected_player)])
+    else:
+        return [], []
+    _, targets = advice_engine(match).evaluate(step)
+    frame = match.frame_at(step)
+    segments = np.full((len(rows), 3, 2), np.nan)
+    segments[:, 0], segments[:, 1] = frame[rows], targets[rows]
+    points = segments.reshape(-1, 2)[:-1].round(2).tolist()
+    return ([None if x != x else x for x, _ in points],
+            [None if y != y else y for _, y in points])
+
+def generate_pitch_visual(match, step, selected_player=None, show_all_advice=False, show_control=False):
+    """Generate pitch visualization with player positions and field markings."""
+    plot_traces = []
+    locations = match.locations_at(step)
+
+    # Pitch control underneath everything else
+    if show_control:
+        plot_traces.append(control_trace(GRID_X, GRID_Y, pitch_control(match).surface(step)))
+
+    # Pitch markings
+    plot_traces.append(go.Scatter(x=[0, 105, 105, 0, 0], y=[0, 0, 68, 68, 0], mode="lines",
+                                  line=dict(color="white", width=2), showlegend=False))
+    plot_traces.append(go.Scatter(x=[52.5, 52.5], y=[0, 68], mode="lines",
+                                  line=dict(color="white", width=2, dash="dash"), showlegend=False))
+    theta = np.linspace(0, 2*np.pi, 100)
+    center_x = 52.5 + 9.15 * np.cos(theta)
+    center_y = 34 + 9.15 * np.sin(theta)
+    plot_traces.append(go.Scatter(x=center_x, y=center_y, mode="lines",
+                                  line=dict(color="white", width=2), showlegend=False))
+    plot_traces.append(go.Scatter(x=[0, 16.5, 16.5, 0, 0], y=[13.84, 13.84, 54.16, 54.16, 13.84], mode="lines",
+                                  line=dict(color="white", width=2), showlegend=False))
+    plot_traces.append(go.Scatter(x=[88.5, 105, 105, 88.5, 88.5], y=[13.84, 13.84, 54.16, 54.16, 13.84], mode="lines",
+                                  line=dict(color="white", width=2), showlegend=False))
+    plot_traces.append(go.Scatter(x=[0, 5.5, 5.5, 0, 0], y=[24.84, 24.84, 43.16, 43.16, 24.84], mode="lines",
+                                  line=dict(color="white", width=2), showlegend=False))
+    plot_traces.append(go.Scatter(x=[99.5, 105, 105, 99.5, 99.5], y=[24.84, 24.84, 43.16, 43.16, 24.84], mode="lines",
+                                  line=dict(color="white", width=2), showlegend=False))
+    plot_traces.append(go.Scatter(x=[0, 0], y=[30.34, 37.66], mode="lines",
+                                  line=dict(color="white", width=4), showlegend=False))
+    plot_traces.append(go.Scatter(x=[105, 105], y=[30.34, 37.66], mode="lines",
+                                  line=dict(color="white", width=4), showlegend=False))
+
+    # Player positions
+    for player_name, (x, y) in locations.items():
+        marker_color = SIDE_COLORS[match.sides[match.player_team[player_name]]]
+        plot_traces.append(go.Scatter(
+            x=[x], y=[y], mode="markers+text", text=[player_name], textposition="top center",
+            marker=dict(size=12, color=marker_color, line=dict(width=2, color='black')),
+            customdata=[player_name], hovertemplate=f"<b>{player_name}</b><br>x: %{{x:.2f}}, y: %{{y:.2f}}<extra></extra>"
+        ))
+
+    line_x, line_y = advice_lines(match, step, selected_player, show_all_advice)
+    if line_x:
+        plot_traces.append(go.Scatter(
+            x=line_x, y=line_y, mode="lines+markers",
+            line=dict(color="yellow", width=2, dash="dash"),
+            marker=dict(size=8, color="yellow")
+        ))
+
+    plot_layout = go.Layout(
+        xaxis=dict(range=[0, PITCH_LENGTH], showgrid=False, zeroline=True, visible=False),
+        yaxis=dict(range=[0, PITCH_WIDTH], showgrid=False, zeroline=True, visible=False),
+        plot_bgcolor="green", height=500, margin=dict(l=20, r=20, t=20, b=20),
+        title="."
+    )
+    return go.Figure(data=plot_traces, layout=plot_layout)
+
+def jump_buttons(match):
+    """One button per kick-off and goal; clicking it seeks the replay to that event."""
+    return [html.Button(label, id={'type': 'jump-event', 'index': i, 'step': step}, n_clicks=0,
+                        style={'marginRight': '6px', 'marginBottom': '4px'})
+            for i, (step, label) in enumerate(match.key_events)]
+
+def region_filter_options(match):
+    return ([{'label': f'{team} (team)', 'value': f'team:{team}'} for team in match.teams] +
+            [{'label': name, 'value': f'player:{name}'} for team in match.teams for name in match.squads[team]])
+
+def live_layout():
+    if live_match is None:
+        return html.Div()
+    return html.Div([
+        dcc.Interval(id='live-timer', interval=1000, n_intervals=0),
+        dcc.Store(id='live-version', data=-1),
+        html.Div(id='live-panel', children="Waiting for live events...")
+    ], style={'border': '2px solid #e74c3c', 'borderRadius': '10px', 'padding': '10px', 'marginTop': '10px'})
+
+def live_panel(live):
+    """Score line, running xG and the latest shots of the live match."""
+    stats = live.team_stats()
+    minute, second = live.clock
+    children = [html.H4(f"LIVE {minute}:{second:02d} - {live.n_events} events", style={'color': '#e74c3c', 'margin': '0 0 5px 0'})]
+    for _, row in stats.iterrows():
+        children.append(html.P(f"{row['Squad']}: {live.goals[row['Squad']]} goals, xG {row['Attack_xG']:.2f} "
+                               f"(balance {row['xG_balance']:+.2f})", style={'fontSize': '14px', 'margin': '2px 0'}))
+    for (shot_minute, shot_second), team, player, xg, outcome in list(live.recent_shots):
+        children.append(html.P(f"{shot_minute}:{shot_second:02d} {player} ({team}) - xG {xg:.2f}, {outcome}",
+                               style={'fontSize': '12px', 'color': '#555', 'margin': '1px 0'}))
+    return children
+
+# Region panel text until part of the pitch is selected, and how many types / players it lists.
+REGION_HINT = "Box- or lasso-select part of the pitch to see the events there."
+REGION_TOP = 5
+
+# Playback speed in events per timer tick (the timer fires every 500 ms).
+PLAYBACK_SPEEDS = [('Pause', 0), ('1x', 1), ('2x', 2), ('4x', 4), ('8x', 8)]
+
+# 'patch' sends the pitch once and then only player coordinates; 'full' rebuilds the figure every tick.
+RENDER_MODE = os.environ.get('FIDASH_RENDER_MODE', 'patch' if Patch is not None else 'full')
+
+def initial_figure(match, step=0, overlay=()):
+    """Figure sent on page load or match change; in patch mode later ticks only update its coordinates."""
+    if RENDER_MODE == 'patch':
+        return base_figure(match.player_names, player_colors(match), match.frame_at(step),
+                           GRID_X, GRID_Y, control_at(match, step, overlay))
+    return generate_pitch_visual(match, step, show_control='control' in overlay)
+
+# -------------------------
+# Page Layout
+# -------------------------
+def page_layout(match):
+    """Page for a match; ``match=None`` gives the empty skeleton callbacks are validated against."""
+    if match is None:
+        title, teams, match_id, options, last_step, marks, clock, figure, buttons, filters = (
+            '', ('', ''), None, [], 0, {}, '', {}, [], [])
+    else:
+        title, teams, match_id = match.title, match.teams, match.match_id
+        options = [{'label': label, 'value': match_id} for match_id, label in registry.available_matches()]
+        last_step, marks, clock = len(match.replay_positions) - 1, match.timeline.marks(), match.timeline.clock(0)
+        figure, buttons, filters = initial_figure(match), jump_buttons(match), region_filter_options(match)
+    return html.Div([
+        html.H1(title, id='match-title'),
+        dcc.Dropdown(id='match-select', value=match_id, clearable=False, options=options,
+                     style={'width': '400px', 'marginBottom': '10px'}),
+        dcc.Checklist(id='advice-overlay', value=[],
+                      options=[{'label': ' Show advice for all players', 'value': 'all'},
+                               {'label': ' Show pitch control', 'value': 'control'}]),
+        dcc.Store(id='session-id', data=str(uuid.uuid4())),
+        dcc.Interval(id='update-timer', interval=500, n_intervals=0),
+        live_layout(),
+        html.Div([
+            html.Span(clock, id='match-clock',
+                      style={'fontSize': '20px', 'fontWeight': 'bold', 'marginRight': '15px'}),
+            dcc.RadioItems(id='playback-speed', value=1, inline=True,
+                           options=[{'label': f' {label} ', 'value': value} for label, value in PLAYBACK_SPEEDS],
+                           style={'display': 'inline-block'})
+        ], style={'marginTop': '10px'}),
+        dcc.Slider(id='timeline-slider', min=0, max=last_step, step=1, value=0, marks=marks, updatemode='mouseup'),
+        html.Div(buttons, id='key-events', style={'marginBottom': '10px'}),
+        html.Div([
+            html.Div([dcc.Graph(id='field-visual', figure=figure)],
+                     style={'width': '75%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+            html.Div([
+                html.H3("Player Insights"),
+                html.Div(id='player-insights', children="Select hunting://Select a player to view stats.",
+                         style={'border': '2px solid #333', 'padding': '15px', 'backgroundColor': '#f9f9f9',
+                                'borderRadius': '10px', 'boxShadow': '2px 2px 8px rgba(0,0,0,0.1)'}),
+                html.H3("Selected Region"),
+                dcc.RadioItems(id='region-points', value='location', inline=True,
+                               options=[{'label': ' Event locations ', 'value': 'location'},
+                                        {'label': ' Pass end points ', 'value': 'pass_end'}]),
+                dcc.Dropdown(id='region-filter', value=None, options=filters, placeholder='All players',
+                             style={'marginTop': '5px'}),
+                html.Div(id='region-events', children=REGION_HINT,
+                         style={'border': '2px solid #333', 'padding': '15px', 'backgroundColor': '#f9f9f9',
+                                'borderRadius': '10px', 'marginTop': '5px'})
+            ], style={'width': '23%', 'display': 'inline-block', 'marginLeft': '2%', 'verticalAlign': 'top'})
+        ]),
+        html.Div([
+            html.Span(teams[0], id='home-label', style={'color': 'blue', 'fontSize': '20px', 'position': 'absolute', 'left': '10%', 'bottom': '5px'}),
+            html.Span(teams[1], id='away-label', style={'color': 'red', 'fontSize': '20px', 'position': 'absolute', 'right': '45%', 'bottom': '5px'})
+        ], style={'position': 'relative', 'height': '40px'})
+    ], style={'padding': '20px'})
+
+def serve_layout():
+    """Build the page layout; called per page load so each browser gets its own session id.
+
+    Dash also calls it to validate the layout on the first request of any kind, often
+    /health from a load balancer; that call gets the skeleton instead of waiting on a match.
+    """
+    from flask import has_request_context, request
+
+    if has_request_context() and not request.path.endswith('_dash-layout'):
+        return page_layout(None)
+    return page_layout(registry.get(DEFAULT_MATCH_ID))
+
+# -------------------------
+# Callbacks
+# -------------------------
+@callback(
+    [Output('match-title', 'children'),
+     Output('home-label', 'children'),
+     Output('away-label', 'children'),
+     Output('timeline-slider', 'max'),
+     Output('timeline-slider', 'marks'),
+     Output('key-events', 'children'),
+     Output('region-filter', 'options'),
+     Output('region-filter', 'value')],
+    Input('match-select', 'value')
+)
+def show_match_header(match_id):
+    match = registry.get(match_id)
+    return (match.title, match.teams[0], match.teams[1], len(match.replay_positions) - 1,
+            match.timeline.marks(), jump_buttons(match), region_filter_options(match), None)
+
+def update_field(match_id, session_id, tick=None, seek_to=None, click_data=None, overlay=(), speed=1):
+    """Advance or seek a session's replay; return (figure or patch, step, match clock).
+
+    A new timer tick moves the replay on by ``speed`` events, ``seek_to`` jumps straight
+    to a step, and anything else (a click, the overlay) redraws the current step.
+    """
+    with metrics.tick(session_id), metrics.profiler.profiled(), metrics.timed('refresh_field'):
+        match = registry.get(match_id)
+        n_steps = len(match.replay_positions)
+        with metrics.timed('refresh_field', 'state'):
+            previous = session_store.get(session_id)
+            selected_player = click_data['points'][0].get('customdata') if click_data else None
+            if previous['match_id'] != match.match_id:
+                step = 0
+            elif seek_to is not None:
+                step = int(seek_to) % n_steps
+            elif tick != previous['tick']:
+                step = (previous['step'] + (speed or 0)) % n_steps
+            else:
+                step = previous['step']
+            session_store.set(session_id, {'match_id': match.match_id, 'step': step, 'tick': tick,
+                                           'selected_player': selected_player})
+        if previous['match_id'] is None:
+            metrics.inc('sessions_started_total')
+        elif tick is not None and previous['tick'] is not None and tick > previous['tick'] + 1:
+            # Interval ticks the browser skipped because an earlier update was still pending.
+            metrics.inc('ticks_dropped_total', tick - previous['tick'] - 1)
+        clock = match.timeline.clock(step)
+        # A new session or a new match needs the full figure; after that only coordinates change.
+        if RENDER_MODE == 'patch' and previous['match_id'] != match.match_id:
+            with metrics.timed('refresh_field', 'figure'):
+                return initial_figure(match, step, overlay), step, clock
+        key = (match.match_id, step, selected_player, 'all' in overlay, 'control' in overlay)
+        response = prefetcher.get(key)
+        if response is None:
+            metrics.inc('prefetch_misses_total')
+            response = render_frame(key, match=match)
+        else:
+            metrics.inc('prefetch_hits_total')
+        if speed:
+            # Render the frames the next ticks will ask for while this one is on the wire.
+            prefetcher.schedule(session_id, [(match.match_id, (step + speed * k) % n_steps) + key[2:]
+                                             for k in range(1, prefetcher.depth + 1)])
+        return response, step, clock
+
+def render_frame(key, callback='refresh_field', match=None):
+    """Figure (or patch) for a (match_id, step, selected player, show all, show control) key."""
+    match_id, step, selected_player, show_all, show_control = key
+    match = match or registry.get(match_id)
+    if RENDER_MODE == 'patch':
+        with metrics.timed(callback, 'advice'):
+            lines = advice_lines(match, step, selected_player, show_all)
+        with metrics.timed(callback, 'control'):
+            control = pitch_control(match).surface(step) if show_control else None
+        with metrics.timed(callback, 'figure'):
+            return frame_patch(match.frame_at(step), *lines, control=control)
+    with metrics.timed(callback, 'figure'):
+        return generate_pitch_visual(match, step, selected_player, show_all, show_control)
+
+def prefetch_frame(key):
+    """render_frame for the look-ahead thread; a match evicted meanwhile is skipped, not reloaded."""
+    match = registry.peek(key[0])
+    return None if match is None else render_frame(key, 'prefetch', match)
+
+# Upcoming frames rendered in the background during playback (FIDASH_LOOKAHEAD_FRAMES ahead).
+prefetcher = FramePrefetcher(prefetch_frame)
+
+@callback(
+    [Output('field-visual', 'figure'),
+     Output('timeline-slider', 'value'),
+     Output('match-clock', 'children')],
+    [Input('update-timer', 'n_intervals'),
+     Input('timeline-slider', 'value'),
+     Input({'type': 'jump-event', 'index': ALL, 'step': ALL}, 'n_clicks'),
+     Input('field-visual', 'clickData'),
+     Input('match-select', 'value'),
+     Input('advice-overlay', 'value')],
+    [State('playback-speed', 'value'),
+     State('session-id', 'data')]
+)
+def refresh_field(tick, slider_step, jump_clicks, click_data, match_id, overlay, speed, session_id):
+    trigger = ctx.triggered_id
+    seek_to = None
+    if trigger == 'timeline-slider':
+        seek_to = slider_step
+    elif isinstance(trigger, dict) and ctx.triggered[0]['value']:
+        # Buttons are re-created on match change with n_clicks=0; only a real click seeks.
+        seek_to = trigger['step']
+    return update_field(match_id, session_id, tick, seek_to, click_data, overlay, speed)
+
+@callback(
+    Output('player-insights', 'children'),
+    Input('field-visual', 'clickData'),
+    [State('match-select', 'value'),
+     State('session-id', 'data')]
+)
+def show_player_insights(click_data, match_id, session_id):
+    if not click_data:
+        return "Click a player to view stats."
+    
+    with metrics.timed('show_player_insights'):
+        # Keyed by step, so a replay that has moved on never gets stale stats.
+        key = (match_id, click_data['points'][0].get('customdata'), session_store.get(session_id)['step'])
+        insights = insights_cache.get(key)
+        if insights is None:
+            insights = player_insights(registry.get(match_id), *key[1:])
+            insights_cache.put(key, insights)
+        return insights
+
+# Rendered insight panels by (match, player, step); repeated clicks are a lookup.
+insights_cache = LRUCache()
+
+def player_insights(match, player_name, step):
+    if player_name not in match.player_roles:
+        return "Click a player to view stats."
+    # Event-derived totals up to the current replay step
+    stats = match.player_stats.as_of(step, player_name)
+    curr_x, curr_y = match.locations_at(step)[player_name]
+    with metrics.timed('show_player_insights', 'advice'):
+        advice, (opt_x, opt_y) = tactical_advice(match, player_name, step)
+    
+    insights = [
+        html.H4(player_name, style={'color': '#2c3e50', 'marginBottom': '10px'}),
+        html.P(f"Position: x={curr_x:.1f}, y={curr_y:.1f}", style={'fontSize': '14px', 'color': '#555'}),
+        html.P(f"As of {match.timeline.clock(step)}", style={'fontSize': '12px', 'color': '#888'}),
+        html.P(f"Goals: {stats['goals']} from {stats['shots']} shots (xG {stats['xg']:.2f})", style={'fontSize': '14px', 'color': '#555'}),
+        html.P(f"Assists: {stats['assists']}", style={'fontSize': '14px', 'color': '#555'}),
+        html.P(f"Passes: {stats['passes_completed']}/{stats['passes']} completed", style={'fontSize': '14px', 'color': '#555'}),
+        html.P(f"Touches: {stats['touches']}", style={'fontSize': '14px', 'color': '#555'}),
+        html.Div([
+            html.Strong("Tactical Advice: ", style={'color': '#e74c3c'}),
+            html.Span(advice, style={'backgroundColor': '#e74c3c', 'color': 'white', 'padding': '5px 10px',
+                                     'borderRadius': '5px', 'display': 'inline-block'})
+        ], style={'marginTop': '15px', 'fontSize': '14px'}),
+        html.P(f"Target Position: x={opt_x:.1f}, y={opt_y:.1f}", style={'fontSize': '14px', 'color': '#555', 'marginTop': '10px'})
+    ]
+    return insights
+
+@callback(
+    Output('region-events', 'children'),
+    [Input('field-visual', 'selectedData'),
+     Input('region-points', 'value'),
+     Input('region-filter', 'value')],
+    State('match-select', 'value')
+)
+def show_region_events(selected_data, points, region_filter, match_id):
+    if not selected_data or not (selected_data.get('range') or selected_data.get('lassoPoints')):
+        return REGION_HINT
+    kind, _, name = (region_filter or '').partition(':')
+    with metrics.timed('show_region_events'):
+        match = registry.get(match_id)
+        index = event_index(match)
+        rows = index.select(selected_data, points, player=name if kind == 'player' else None,
+                            team=name if kind == 'team' else None)
+        return region_summary(index.frame(rows, points), points)
+
+def region_summary(events, points):
+    """Counts by event type and the most involved players for the events in a selected region."""
+    if points == 'pass_end':
+        completed = int(events['pass_outcome'].isna().sum())
+        children = [html.P(f"{len(events)} passes ending here, {completed} completed",
+                           style={'fontSize': '14px', 'fontWeight': 'bold'})]
+    else:
+        children = [html.P(f"{len(events)} events in region", style={'fontSize': '14px', 'fontWeight': 'bold'})]
+        for kind, count in events['type'].astype(str).value_counts().head(REGION_TOP).items():
+            children.append(html.P(f"{kind}: {count}", style={'fontSize': '13px', 'color': '#555', 'margin': '1px 0'}))
+    players = events['player_name'].value_counts().head(REGION_TOP)
+    if len(players):
+        children.append(html.P("Most involved: " + ", ".join(f"{name} ({count})" for name, count in players.items()),
+                               style={'fontSize': '13px', 'color': '#555', 'marginTop': '8px'}))
+    return children
+
+if live_match is not None:
+    @callback(
+        [Output('live-panel', 'children'),
+         Output('live-version', 'data')],
+        Input('live-timer', 'n_intervals'),
+        State('live-version', 'data')
+    )
+    def show_live_stats(tick, seen_version):
+        # Dashboards poll once a second and only receive a new panel when events arrived.
+        version = live_match.version
+        if version == seen_version:
+            return dash.no_update, dash.no_update
+        return live_panel(live_match), version
+
+# -------------------------
+# App Factory
+# -------------------------
+def warm_up():
+    """Load the default match and everything its first page needs, then mark the app ready."""
+    global warm_up_error
+    try:
+        match = registry.get(DEFAULT_MATCH_ID)
+        advice_engine(match)
+        initial_figure(match)
+        if CONTROL_WORKERS:
+            pitch_control(match).precompute(int(CONTROL_WORKERS))
+    except Exception as exc:  # reported on /health; pages retry the load on request
+        warm_up_error = f"{type(exc).__name__}: {exc}"
+    finally:
+        ready.set()
+
+def health():
+    """Readiness for load balancers: 200 once warm, 503 while warming up or after a failed warm-up."""
+    from flask import jsonify
+
+    global warm_up_error
+    if warm_up_error and DEFAULT_MATCH_ID in registry.loaded():
+        # A page request has loaded the default match since, so the failure was transient.
+        warm_up_error = None
+    status = 'error' if warm_up_error else 'ready' if ready.is_set() else 'warming'
+    body = {'status': status, 'matches_loaded': registry.loaded(), 'xg_model': registry.xg_model is not None,
+            'live_feed': LIVE_FEED}
+    if warm_up_error:
+        body['error'] = warm_up_error
+    return jsonify(body), 200 if status == 'ready' else 503
+
+def build_app(warm=True):
+    """Create the Dash app; match data loads in a background warm-up (``warm``) or on first request."""
+    dash_app = dash.Dash(__name__)
+    dash_app.title = "Soccer Interactive Dashboard"
+    # Validating against the skeleton keeps Dash from calling serve_layout, and loading a match, here.
+    dash_app.validation_layout = page_layout(None)
+    dash_app.layout = serve_layout
+    server = dash_app.server
+    server.add_url_rule('/health', 'health', health)
+    # Prometheus text on /metrics; POST /metrics/profile?ticks=N records a cProfile of the next N ticks.
+    metrics.init_app(server, gauges={'sessions': lambda: len(session_store),
+                                     'matches_loaded': lambda: len(registry.loaded())})
+    if live_match is not None:
+        start_feed(LIVE_FEED, live_match)
+    if warm:
+        threading.Thread(target=warm_up, name='fidash-warm-up', daemon=True).start()
+    else:
+        ready.set()
+    return dash_app
\ No newline at end of file
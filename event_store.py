@@ -0,0 +1,98 @@
+"""Columnar event store: StatsBomb events flattened once into typed, contiguous columns."""
+import numpy as np
+import pandas as pd
+
+PITCH_LENGTH = 105
+PITCH_WIDTH = 68
+
+# Period 5 is the penalty shoot-out; its kicks are not match goals, shots or xG.
+SHOOTOUT_PERIOD = 5
+
+# StatsBomb goal centre, in StatsBomb (120 x 80) units.
+GOAL_X = 120
+GOAL_Y = 40
+
+CATEGORICAL_COLUMNS = ['type', 'team', 'player', 'position', 'play_pattern', 'shot_outcome', 'pass_outcome']
+INT_COLUMNS = {'index': np.int32, 'period': np.int8, 'minute': np.int16, 'second': np.int8}
+ID_COLUMNS = ['player_id', 'pass_recipient_id', 'team_id']
+BOOL_COLUMNS = ['pass_goal_assist']
+LOCATION_COLUMNS = {'location': ('x', 'y'), 'pass_end_location': ('end_x', 'end_y')}
+
+
+def _split_xy(series):
+    """Unpack a column of [x, y, ...] cells into two float32 arrays (NaN where missing)."""
+    xs = np.full(len(series), np.nan, dtype=np.float32)
+    ys = np.full(len(series), np.nan, dtype=np.float32)
+    mask = series.map(lambda v: v is not None and not isinstance(v, float) and len(v) >= 2).to_numpy()
+    if mask.any():
+        coords = np.array([(v[0], v[1]) for v in series[mask]], dtype=np.float32)
+        xs[mask], ys[mask] = coords[:, 0], coords[:, 1]
+    return xs, ys
+
+
+def build_event_store(match_events):
+    """Return a slim copy of the events with flat coordinates, int ids and categorical labels.
+
+    Rows are put in match order (period, then StatsBomb's event index): statsbombpy
+    returns them grouped by event type, and steps, the clock and running totals all
+    assume chronological rows. Columns not needed by the dashboard are dropped. Ids use
+    -1 for "none" and coordinates stay in StatsBomb units (see ``to_pitch`` for 105 x 68).
+    """
+    order = [name for name in ('period', 'index') if name in match_events]
+    if order:
+        match_events = match_events.sort_values(order, kind='stable')
+    match_events = match_events.reset_index(drop=True)
+    n = len(match_events)
+    columns = {}
+    for name, dtype in INT_COLUMNS.items():
+        if name in match_events:
+            columns[name] = match_events[name].fillna(0).to_numpy(dtype)
+    for name in ID_COLUMNS:
+        if name in match_events:
+            columns[name] = match_events[name].fillna(-1).to_numpy(np.int32)
+        else:
+            columns[name] = np.full(n, -1, dtype=np.int32)
+    for source, (x_name, y_name) in LOCATION_COLUMNS.items():
+        if source in match_events:
+            columns[x_name], columns[y_name] = _split_xy(match_events[source])
+        else:
+            columns[x_name] = columns[y_name] = np.full(n, np.nan, dtype=np.float32)
+    for name in BOOL_COLUMNS:
+        if name in match_events:
+            columns[name] = match_events[name].fillna(False).to_numpy(bool)
+    for name in CATEGORICAL_COLUMNS:
+        values = match_events[name] if name in match_events else pd.Series([None] * n)
+        columns[name] = pd.Categorical(values.to_numpy())
+    if 'shot_statsbomb_xg' in match_events:
+        columns['shot_statsbomb_xg'] = match_events['shot_statsbomb_xg'].to_numpy(np.float32)
+    return pd.DataFrame(columns)
+
+
+def to_pitch(x, y):
+    """Vectorised StatsBomb (120x80) to pitch (105x68) transform for arrays or scalars."""
+    return x * (PITCH_LENGTH / 120), y * (PITCH_WIDTH / 80)
+
+
+def shot_geometry(x, y):
+    """Distance and angle (degrees) to the goal centre from StatsBomb coordinates, arrays or scalars."""
+    dx, dy = GOAL_X - x, GOAL_Y - y
+    return np.hypot(dx, dy), np.abs(np.degrees(np.arctan2(dy, dx)))
+
+
+def shot_features(events):
+    """Shots with distance, angle, goal flag and pitch coordinates, each one vectorised expression."""
+    shots = events[events['type'] == 'Shot']
+    x = shots['x'].to_numpy(np.float64)
+    y = shots['y'].to_numpy(np.float64)
+    distance, angle = shot_geometry(x, y)
+    pitch_x, pitch_y = to_pitch(x, y)
+    return pd.DataFrame({
+        'team': shots['team'].to_numpy(),
+        'player_id': shots['player_id'].to_numpy(),
+        'period': shots['period'].to_numpy(),
+        'shot_distance': distance,
+        'shot_angle': angle,
+        'is_goal': (shots['shot_outcome'] == 'Goal').to_numpy(np.int8),
+        'pitch_x': pitch_x,
+        'pitch_y': pitch_y,
+    }, index=shots.index)
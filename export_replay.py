@@ -0,0 +1,161 @@
+"""Export a replay, whole or a time window, as a self-contained animation that needs no server.
+
+Usage:
+    python export_replay.py MATCH_ID clip.html [--start MM:SS] [--end MM:SS] [--every N]
+                            [--fps N] [--control] [--workers N]
+    python export_replay.py MATCH_ID frames/ ...     # PNG sequence (needs kaleido)
+    python export_replay.py MATCH_ID clip.mp4 ...    # PNG sequence encoded with ffmpeg
+
+The HTML file embeds plotly.js and every frame, so it can be shared and opened offline.
+Frames are built from the precomputed replay positions, in chunks across a process pool.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import plotly.io as pio
+
+from pitch_control import GRID_X, GRID_Y, PitchControl
+from pitch_figure import CONTROL_TRACE, PLAYERS_TRACE, base_figure, player_colors
+
+DEFAULT_FPS = 10
+# Frames per task handed to a worker process.
+CHUNK_FRAMES = 250
+IMAGE_WIDTH = 1000
+IMAGE_HEIGHT = 650
+
+
+def parse_clock(text):
+    """'67:30' or '67' -> (67, 30) / (67, 0)."""
+    minute, _, second = text.partition(':')
+    return int(minute), int(second or 0)
+
+
+def export_steps(match, start=None, end=None, every=1):
+    """Replay steps between two match clocks (inclusive), every ``every``-th event."""
+    first = match.timeline.seek(*parse_clock(start)) if start else 0
+    last = match.timeline.seek(*parse_clock(end)) if end else len(match.replay_positions) - 1
+    return np.arange(first, max(last, first) + 1, every)
+
+
+def _map_chunks(fn, tasks, workers):
+    if workers == 1 or len(tasks) == 1:
+        return [fn(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, *zip(*tasks)))
+
+
+def _chunks(steps, positions, control):
+    return [(steps[i:i + CHUNK_FRAMES], positions[i:i + CHUNK_FRAMES],
+             None if control is None else control[i:i + CHUNK_FRAMES])
+            for i in range(0, len(steps), CHUNK_FRAMES)]
+
+
+# -------------------------
+# Plotly animation
+# -------------------------
+def animation_frames(steps, positions, control=None):
+    """Plotly frames updating only the player trace (and the control heatmap when given)."""
+    frames = []
+    for i, step in enumerate(steps):
+        data = [{'x': positions[i, :, 0].round(2).tolist(), 'y': positions[i, :, 1].round(2).tolist()}]
+        traces = [PLAYERS_TRACE]
+        if control is not None:
+            data.append({'z': control[i].tolist()})
+            traces.append(CONTROL_TRACE)
+        frames.append({'name': str(step), 'data': data, 'traces': traces})
+    return frames
+
+
+def export_html(match, steps, path, control=None, fps=DEFAULT_FPS, workers=None):
+    positions = match.replay_positions[steps]
+    figure = base_figure(match.player_names, player_colors(match), positions[0], GRID_X, GRID_Y,
+                         None if control is None else control[0]).to_plotly_json()
+    chunks = _map_chunks(animation_frames, _chunks(steps, positions, control), workers)
+    figure['frames'] = [frame for chunk in chunks for frame in chunk]
+
+    duration = 1000 / fps
+    play = {'frame': {'duration': duration, 'redraw': control is not None},
+            'transition': {'duration': 0}, 'fromcurrent': True, 'mode': 'immediate'}
+    figure['layout'].update(
+        title=f"{match.title} {match.timeline.clock(steps[0])}-{match.timeline.clock(steps[-1])}",
+        height=560,
+        updatemenus=[{'type': 'buttons', 'direction': 'left', 'x': 0, 'y': -0.02, 'xanchor': 'left',
+                      'buttons': [{'label': 'Play', 'method': 'animate', 'args': [None, play]},
+                                  {'label': 'Pause', 'method': 'animate',
+                                   'args': [[None], {'frame': {'duration': 0}, 'mode': 'immediate'}]}]}],
+        sliders=[{'x': 0.12, 'len': 0.88, 'y': -0.02, 'currentvalue': {'prefix': 'Clock '},
+                  'steps': [{'label': match.timeline.clock(step), 'method': 'animate',
+                             'args': [[str(step)], {'frame': {'duration': 0, 'redraw': control is not None},
+                                                    'mode': 'immediate'}]} for step in steps]}])
+    pio.write_html(figure, path, include_plotlyjs=True, auto_play=False, validate=False)
+
+
+# -------------------------
+# Images and video
+# -------------------------
+def render_images(offset, positions, control, titles, names, colors, out_dir):
+    """Write frame_NNNNN.png for each frame of a chunk; runs in a worker process."""
+    for i, title in enumerate(titles):
+        figure = base_figure(names, colors, positions[i], GRID_X, GRID_Y,
+                             None if control is None else control[i])
+        figure.update_layout(title=title)
+        figure.write_image(os.path.join(out_dir, f"frame_{offset + i:05d}.png"),
+                           width=IMAGE_WIDTH, height=IMAGE_HEIGHT)
+    return len(titles)
+
+
+def export_images(match, steps, out_dir, control=None, workers=None):
+    os.makedirs(out_dir, exist_ok=True)
+    positions = match.replay_positions[steps]
+    titles = [f"{match.title} {match.timeline.clock(step)}" for step in steps]
+    tasks = [(i, chunk_positions, chunk_control, titles[i:i + CHUNK_FRAMES],
+              match.player_names, player_colors(match), out_dir)
+             for i, (_, chunk_positions, chunk_control) in zip(range(0, len(steps), CHUNK_FRAMES),
+                                                                _chunks(steps, positions, control))]
+    return sum(_map_chunks(render_images, tasks, workers))
+
+
+def export_video(match, steps, path, control=None, fps=DEFAULT_FPS, workers=None):
+    if shutil.which('ffmpeg') is None:
+        raise RuntimeError("ffmpeg is needed for video export; export a PNG sequence or HTML instead.")
+    with tempfile.TemporaryDirectory(prefix='fidash-frames-') as frames_dir:
+        export_images(match, steps, frames_dir, control, workers)
+        subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-framerate', str(fps),
+                        '-i', os.path.join(frames_dir, 'frame_%05d.png'), '-pix_fmt', 'yuv420p', path], check=True)
+
+
+def export(match, path, start=None, end=None, every=1, fps=DEFAULT_FPS, with_control=False, workers=None):
+    """Export to ``path``: .html animation, .mp4/.webm/.gif video, anything else a PNG directory."""
+    workers = workers or os.cpu_count() or 1
+    steps = export_steps(match, start, end, every)
+    control = PitchControl(match).surfaces(steps, workers) if with_control else None
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.html':
+        export_html(match, steps, path, control, fps, workers)
+    elif extension in ('.mp4', '.webm', '.gif'):
+        export_video(match, steps, path, control, fps, workers)
+    else:
+        export_images(match, steps, path, control, workers)
+    return len(steps)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) < 2:
+        sys.exit(__doc__)
+
+    def option(name, default=None):
+        return args[args.index(name) + 1] if name in args else default
+
+    from match_registry import MatchRegistry
+
+    match = MatchRegistry().get(int(args[0]))
+    workers = option('--workers')
+    n_frames = export(match, args[1], option('--start'), option('--end'), int(option('--every', 1)),
+                      float(option('--fps', DEFAULT_FPS)), '--control' in args, int(workers) if workers else None)
+    print(f"Exported {n_frames} frames of {match.title} -> {args[1]}")
@@ -0,0 +1,191 @@
+"""Live mode: consume events one at a time and keep xG and team balance current in O(1) per event.
+
+Sources are newline-delimited JSON events (raw StatsBomb or already flattened), either
+a file that is tailed as it grows or a local TCP socket:
+
+    FIDASH_LIVE_FEED=file:/tmp/live.jsonl python FIDashBoard.py
+    python live_feed.py play events/3869685.json file:/tmp/live.jsonl --rate 20
+
+TCP sources bind a port, so run the dashboard with a single worker when using one.
+"""
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+import metrics
+from event_store import shot_geometry
+from match_cache import flatten_event
+
+POLL_INTERVAL = 0.2
+RECENT_SHOTS = 5
+
+
+class LiveMatch:
+    """Running totals for a match being fed event by event."""
+
+    def __init__(self, xg_model=None):
+        self.xg_model = xg_model
+        self.teams = []
+        self.team_xg = {}
+        self.goals = {}
+        self.recent_shots = deque(maxlen=RECENT_SHOTS)
+        self.n_events = 0
+        self.clock = (0, 0)
+        # Bumped on every change, so dashboards only re-render when something happened.
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def _add_team(self, team):
+        if team and team not in self.team_xg and len(self.teams) < 2:
+            self.teams.append(team)
+            self.team_xg[team] = 0.0
+            self.goals[team] = 0
+
+    def opponent(self, team):
+        return next((t for t in self.teams if t != team), None)
+
+    def shot_xg(self, row):
+        location = row.get('location')
+        if self.xg_model is None or not isinstance(location, (list, tuple)) or len(location) < 2:
+            return float(row.get('shot_statsbomb_xg') or 0.0)
+        distance, angle = shot_geometry(float(location[0]), float(location[1]))
+        return float(self.xg_model.predict([[distance, angle]])[0])
+
+    def ingest(self, event):
+        """Apply one event; shots are scored with the xG model as they arrive."""
+        row = flatten_event(event)
+        with self._lock:
+            team = row.get('team')
+            self._add_team(team)
+            self.n_events += 1
+            self.clock = (row.get('minute') or 0, row.get('second') or 0)
+            kind = row.get('type')
+            if kind == 'Shot' and team in self.team_xg:
+                xg = self.shot_xg(row)
+                self.team_xg[team] += xg
+                if row.get('shot_outcome') == 'Goal':
+                    self.goals[team] += 1
+                self.recent_shots.appendleft((self.clock, team, row.get('player'), xg, row.get('shot_outcome')))
+            elif kind == 'Own Goal For' and team in self.goals:
+                self.goals[team] += 1
+            self.version += 1
+
+    def team_stats(self):
+        """Same columns as MatchData.team_stats, from the running totals."""
+        with self._lock:
+            attack = [self.team_xg[team] for team in self.teams]
+            defense = [self.team_xg.get(self.opponent(team), 0.0) for team in self.teams]
+            return pd.DataFrame({'Squad': list(self.teams), 'Attack_xG': attack, 'Defense_xG': defense,
+                                 'xG_balance': [a - d for a, d in zip(attack, defense)]})
+
+
+# -------------------------
+# Sources
+# -------------------------
+def _parse(line):
+    """One JSON event, or None (counted) for a malformed or truncated line."""
+    try:
+        return json.loads(line)
+    except ValueError:
+        metrics.inc('live_lines_malformed_total')
+        return None
+
+
+def tail_jsonl(path, stop, poll_interval=POLL_INTERVAL):
+    """Yield JSON objects appended to ``path`` from its start onwards until ``stop`` is set."""
+    while not os.path.exists(path):
+        if stop.wait(poll_interval):
+            return
+    with open(path, encoding='utf-8') as f:
+        pending = ''
+        while not stop.is_set():
+            line = f.readline()
+            if not line:
+                stop.wait(poll_interval)
+                continue
+            pending += line
+            # A writer may be mid-line; wait for the newline before parsing.
+            if not pending.endswith('\n'):
+                continue
+            event = _parse(pending) if pending.strip() else None
+            pending = ''
+            if event is not None:
+                yield event
+
+
+def socket_events(host, port, stop, poll_interval=POLL_INTERVAL):
+    """Accept local connections one after another and yield the JSON lines each sends."""
+    with socket.create_server((host, port)) as server:
+        server.settimeout(poll_interval)
+        while not stop.is_set():
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            with conn, conn.makefile('r', encoding='utf-8') as lines:
+                for line in lines:
+                    event = _parse(line) if line.strip() else None
+                    if event is not None:
+                        yield event
+                    if stop.is_set():
+                        return
+
+
+def open_source(spec, stop):
+    """``file:PATH`` or ``tcp:HOST:PORT``."""
+    kind, _, target = spec.partition(':')
+    if kind == 'file':
+        return tail_jsonl(target, stop)
+    if kind == 'tcp':
+        host, _, port = target.rpartition(':')
+        return socket_events(host or '127.0.0.1', int(port), stop)
+    raise ValueError(f"Unknown live feed {spec!r}; expected file:PATH or tcp:HOST:PORT")
+
+
+def start_feed(spec, live_match):
+    """Consume ``spec`` into ``live_match`` on a daemon thread; set the returned event to stop."""
+    stop = threading.Event()
+
+    def run():
+        for event in open_source(spec, stop):
+            try:
+                live_match.ingest(event)
+            except Exception:  # one bad event must not end the feed
+                metrics.inc('live_events_failed_total')
+
+    threading.Thread(target=run, name='fidash-live-feed', daemon=True).start()
+    return stop
+
+
+# -------------------------
+# Feed simulator
+# -------------------------
+def play(events_path, spec, rate):
+    """Write a recorded match's events to a live source at ``rate`` events per second."""
+    with open(events_path, encoding='utf-8') as f:
+        events = json.load(f)
+    kind, _, target = spec.partition(':')
+    if kind == 'file':
+        out = open(target, 'a', encoding='utf-8')
+    else:
+        host, _, port = target.rpartition(':')
+        out = socket.create_connection((host or '127.0.0.1', int(port))).makefile('w', encoding='utf-8')
+    with out:
+        for event in events:
+            out.write(json.dumps(event) + '\n')
+            out.flush()
+            time.sleep(1 / rate)
+
+
+if __name__ == '__main__':
+    # Usage: python live_feed.py play EVENTS_JSON file:PATH|tcp:HOST:PORT [--rate N]
+    args = sys.argv[1:]
+    if len(args) < 3 or args[0] != 'play':
+        sys.exit("Usage: python live_feed.py play EVENTS_JSON file:PATH|tcp:HOST:PORT [--rate N]")
+    play(args[1], args[2], float(args[args.index('--rate') + 1]) if '--rate' in args else 10.0)
@@ -0,0 +1,282 @@
+"""Local on-disk cache and offline loading for StatsBomb events and lineups."""
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+import pandas as pd
+
+# Bump when the on-disk layout changes; older entries are refetched.
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'FIDASH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'fidashboard'))
+DEFAULT_FIXTURE_DIR = os.environ.get('FIDASH_FIXTURE_DIR')
+OFFLINE = os.environ.get('FIDASH_OFFLINE', '0').lower() in ('1', 'true', 'yes')
+
+# StatsBomb objects flattened to "<key>" (name) and "<key>_id" (id), as statsbombpy does.
+_NAMED_KEYS = ('type', 'team', 'player', 'position', 'possession_team', 'play_pattern')
+
+
+class MatchDataUnavailable(RuntimeError):
+    """Raised when a match is neither cached nor fetchable (e.g. offline mode)."""
+
+
+# -------------------------
+# Frame encoding
+# -------------------------
+def _is_numeric_list(value):
+    return isinstance(value, list) and all(isinstance(v, (int, float)) for v in value)
+
+
+def _encode_frame(frame):
+    """Make object columns storable: numeric lists stay native, other nested values become JSON."""
+    frame = frame.copy()
+    json_columns = []
+    for column in frame.columns:
+        if frame[column].dtype != object:
+            continue
+        values = frame[column].dropna()
+        if not values.map(lambda v: isinstance(v, (list, dict))).any():
+            continue
+        if values.map(_is_numeric_list).all():
+            frame[column] = frame[column].where(frame[column].notna(), None)
+        else:
+            frame[column] = frame[column].map(
+                lambda v: json.dumps(v) if isinstance(v, (list, dict)) else None)
+            json_columns.append(column)
+    return frame, json_columns
+
+
+def _decode_frame(frame, json_columns):
+    for column in json_columns:
+        frame[column] = frame[column].map(lambda v: json.loads(v) if isinstance(v, str) else None)
+    return frame
+
+
+def _write_frame(frame, path_base):
+    """Write a frame as Parquet, falling back to pickle when no Parquet engine is installed."""
+    try:
+        frame.to_parquet(path_base + '.parquet', index=False)
+        return 'parquet'
+    except ImportError:
+        frame.to_pickle(path_base + '.pkl')
+        return 'pickle'
+
+
+def _read_frame(path_base, fmt):
+    if fmt == 'parquet':
+        return pd.read_parquet(path_base + '.parquet')
+    return pd.read_pickle(path_base + '.pkl')
+
+
+# -------------------------
+# Cache entries
+# -------------------------
+def match_dir(match_id, cache_dir=None):
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, str(match_id))
+
+
+def read_cached(match_id, cache_dir=None):
+    """Return (events, lineups) from the cache, or None if missing or stale."""
+    entry = match_dir(match_id, cache_dir)
+    try:
+        with open(os.path.join(entry, 'meta.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('cache_version') != CACHE_VERSION:
+        return None
+    try:
+        events = _read_frame(os.path.join(entry, 'events'), meta['format'])
+        lineup_frame = _read_frame(os.path.join(entry, 'lineups'), meta['format'])
+    except (OSError, ImportError, ValueError):
+        return None
+    events = _decode_frame(events, meta['events_json_columns'])
+    lineup_frame = _decode_frame(lineup_frame, meta['lineups_json_columns'])
+    lineups = {team: lineup_frame[lineup_frame['_team'] == team].drop(columns='_team').reset_index(drop=True)
+               for team in meta['teams']}
+    return events, lineups
+
+
+def write_cache(match_id, events, lineups, cache_dir=None, source='statsbomb'):
+    """Store events and lineups for a match, replacing any previous entry.
+
+    The entry is written in full to a staging directory and then moved into place, so
+    readers never see a partial entry. Between removing the old entry and the move
+    there is briefly none, and a reader in that window falls back to loading the match.
+    """
+    entry = match_dir(match_id, cache_dir)
+    staging = f"{entry}.tmp-{os.getpid()}-{threading.get_ident()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    try:
+        _write_entry(staging, match_id, events, lineups, source)
+        shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.replace(staging, entry)
+        except OSError:
+            # Another process stored the same match in between; its entry is as good as ours.
+            if read_cached(match_id, cache_dir) is None:
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _write_entry(staging, match_id, events, lineups, source):
+    teams = list(lineups)
+    lineup_frame = pd.concat([frame.assign(_team=team) for team, frame in lineups.items()], ignore_index=True)
+    events_enc, events_json = _encode_frame(events)
+    lineups_enc, lineups_json = _encode_frame(lineup_frame)
+    fmt = _write_frame(events_enc, os.path.join(staging, 'events'))
+    _write_frame(lineups_enc, os.path.join(staging, 'lineups'))
+
+    meta = {
+        'cache_version': CACHE_VERSION,
+        'match_id': match_id,
+        'source': source,
+        'fetched_at': time.time(),
+        'format': fmt,
+        'teams': teams,
+        'events_json_columns': events_json,
+        'lineups_json_columns': lineups_json,
+    }
+    with open(os.path.join(staging, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+
+def _store(match_id, events, lineups, cache_dir, source):
+    """write_cache for loaders: the data is already in hand, so a failed write only loses the cache."""
+    try:
+        write_cache(match_id, events, lineups, cache_dir=cache_dir, source=source)
+    except OSError:
+        pass
+
+
+def cached_matches(cache_dir=None):
+    """Return {match_id: [team, ...]} for every current cache entry."""
+    root = cache_dir or DEFAULT_CACHE_DIR
+    matches = {}
+    if not os.path.isdir(root):
+        return matches
+    for name in os.listdir(root):
+        if not name.isdigit():
+            continue
+        try:
+            with open(os.path.join(root, name, 'meta.json')) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if meta.get('cache_version') == CACHE_VERSION:
+            matches[int(name)] = meta.get('teams', [])
+    return matches
+
+
+def invalidate(match_id, cache_dir=None):
+    """Drop the cache entry for a match so the next load refetches it."""
+    shutil.rmtree(match_dir(match_id, cache_dir), ignore_errors=True)
+
+
+# -------------------------
+# Fixture (StatsBomb open-data JSON) loading
+# -------------------------
+def flatten_event(event):
+    """Flatten a raw StatsBomb event into statsbombpy's column layout."""
+    row = {}
+    for key, value in event.items():
+        if key in _NAMED_KEYS and isinstance(value, dict):
+            row[key] = value.get('name')
+            row[f'{key}_id'] = value.get('id')
+        elif isinstance(value, dict) and key != 'tactics':
+            for sub_key, sub_value in value.items():
+                column = f'{key}_{sub_key}'
+                if isinstance(sub_value, dict) and 'name' in sub_value:
+                    row[column] = sub_value['name']
+                    row[f'{column}_id'] = sub_value.get('id')
+                else:
+                    row[column] = sub_value
+        else:
+            row[key] = value
+    return row
+
+
+def load_fixture(match_id, fixture_dir):
+    """Load a match from a local open-data tree (events/<id>.json, lineups/<id>.json)."""
+    events_path = os.path.join(fixture_dir, 'events', f'{match_id}.json')
+    lineups_path = os.path.join(fixture_dir, 'lineups', f'{match_id}.json')
+    if not (os.path.exists(events_path) and os.path.exists(lineups_path)):
+        return None
+    with open(events_path, encoding='utf-8') as f:
+        events = pd.DataFrame([flatten_event(e) for e in json.load(f)])
+    events['match_id'] = match_id
+    with open(lineups_path, encoding='utf-8') as f:
+        raw_lineups = json.load(f)
+    lineups = {}
+    for team in raw_lineups:
+        frame = pd.DataFrame(team['lineup'])
+        if 'country' in frame:
+            frame['country'] = frame['country'].map(lambda c: c.get('name') if isinstance(c, dict) else c)
+        lineups[team['team_name']] = frame
+    return events, lineups
+
+
+def competition_matches(competition_id, season_id, fixture_dir=None, offline=None):
+    """Match ids of a competition season, from fixtures (matches/<competition>/<season>.json) or StatsBomb."""
+    fixture_dir = fixture_dir or DEFAULT_FIXTURE_DIR
+    offline = OFFLINE if offline is None else offline
+    if fixture_dir:
+        path = os.path.join(fixture_dir, 'matches', str(competition_id), f'{season_id}.json')
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return sorted(match['match_id'] for match in json.load(f))
+    if offline:
+        raise MatchDataUnavailable(
+            f"No fixture match list for competition {competition_id}, season {season_id} (offline mode).")
+
+    from statsbombpy import sb
+    return sorted(sb.matches(competition_id=competition_id, season_id=season_id)['match_id'].tolist())
+
+
+# -------------------------
+# Public entry point
+# -------------------------
+def load_match(match_id, cache_dir=None, fixture_dir=None, offline=None, refresh=False):
+    """Return (events, lineups) for a match: cache first, then fixtures, then the StatsBomb API."""
+    fixture_dir = fixture_dir or DEFAULT_FIXTURE_DIR
+    offline = OFFLINE if offline is None else offline
+
+    if not refresh:
+        cached = read_cached(match_id, cache_dir)
+        if cached is not None:
+            return cached
+
+    if fixture_dir:
+        loaded = load_fixture(match_id, fixture_dir)
+        if loaded is not None:
+            _store(match_id, *loaded, cache_dir, 'fixture')
+            return loaded
+
+    if offline:
+        raise MatchDataUnavailable(
+            f"Match {match_id} is not cached and no fixture was found (offline mode).")
+
+    from statsbombpy import sb
+    events = sb.events(match_id=match_id)
+    lineups = sb.lineups(match_id=match_id)
+    _store(match_id, events, lineups, cache_dir, 'statsbomb')
+    return events, lineups
+
+
+if __name__ == '__main__':
+    # Usage: python match_cache.py [--refresh|--invalidate] MATCH_ID [MATCH_ID ...]
+    args = sys.argv[1:]
+    mode = args.pop(0) if args and args[0].startswith('--') else None
+    for arg in args:
+        if mode == '--invalidate':
+            invalidate(int(arg))
+            print(f"{arg}: invalidated")
+        else:
+            ev, lu = load_match(int(arg), refresh=(mode == '--refresh'))
+            print(f"{arg}: {len(ev)} events, {sum(len(t) for t in lu.values())} lineup rows cached")
@@ -0,0 +1,272 @@
+"""Registry of matches, loaded lazily and evicted least-recently-used under a memory budget."""
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from event_store import PITCH_LENGTH, PITCH_WIDTH, SHOOTOUT_PERIOD, build_event_store, shot_features, to_pitch
+from match_cache import cached_matches, load_match
+from player_stats import PlayerStats
+from replay import build_replay, positions_from_frame
+from timeline import Timeline
+from xg_model import FEATURES, XGModel, attack_target, load_model
+
+DEFAULT_MATCH_ID = int(os.environ.get('FIDASH_DEFAULT_MATCH', 3869685))
+MATCH_IDS = [int(m) for m in os.environ.get('FIDASH_MATCH_IDS', str(DEFAULT_MATCH_ID)).split(',') if m.strip()]
+MEMORY_BUDGET_BYTES = int(float(os.environ.get('FIDASH_MATCH_MEMORY_MB', 512)) * 2 ** 20)
+# Per-match engines the dashboard attaches on first use; counted in MatchData.nbytes().
+ATTACHED = ('pitch_control', 'advice_engine', 'event_index')
+# Output of batch_analytics.py; stored replays there are used instead of re-simulating.
+ANALYTICS_DIR = os.environ.get('FIDASH_ANALYTICS_DIR')
+
+# Attacking target (StatsBomb units) when a match has no usable xG model.
+DEFAULT_ATTACK_TARGET = (103, 40)
+
+# StatsBomb position_id -> (role, x, y) for a team attacking towards x = 105.
+POSITION_LAYOUT = {
+    1: ('GK', 5, 34),
+    2: ('DEF', 20, 8), 3: ('DEF', 18, 24), 4: ('DEF', 17, 34), 5: ('DEF', 18, 44), 6: ('DEF', 20, 60),
+    7: ('DEF', 28, 6), 8: ('DEF', 28, 62),
+    9: ('MID', 32, 24), 10: ('MID', 32, 34), 11: ('MID', 32, 44),
+    12: ('MID', 42, 8), 13: ('MID', 40, 24), 14: ('MID', 40, 34), 15: ('MID', 40, 44), 16: ('MID', 42, 60),
+    17: ('FWD', 58, 10), 18: ('MID', 50, 24), 19: ('MID', 50, 34), 20: ('MID', 50, 44), 21: ('FWD', 58, 58),
+    22: ('FWD', 60, 26), 23: ('FWD', 62, 34), 24: ('FWD', 60, 42), 25: ('FWD', 56, 34),
+}
+
+
+def get_movement_bounds(role, side):
+    """Define movement boundaries based on player role and which half the team defends."""
+    if role == 'GK':
+        return (0, 18, 22, 46) if side == 'left' else (87, 105, 22, 46)
+    elif role == 'DEF':
+        return (0, 52.5, 0, 68) if side == 'left' else (52.5, 105, 0, 68)
+    elif role == 'MID':
+        return (0, 105, 0, 68)
+    elif role == 'FWD':
+        return (52.5, 105, 0, 68) if side == 'left' else (0, 52.5, 0, 68)
+
+
+def _mirror(x, y):
+    return PITCH_LENGTH - x, PITCH_WIDTH - y
+
+
+def display_name(row):
+    """Prefer the short nickname ("Lionel Messi") over the full registered name."""
+    nickname = row.get('player_nickname')
+    return nickname if isinstance(nickname, str) and nickname else row['player_name']
+
+
+def _starting_position_id(positions):
+    for spell in positions if isinstance(positions, list) else []:
+        if spell.get('start_reason') == 'Starting XI':
+            return spell.get('position_id')
+    return None
+
+
+def _first_position_id(positions):
+    """Position of a player's first spell on the pitch, starter or substitute; None if unused."""
+    for spell in positions if isinstance(positions, list) else []:
+        return spell.get('position_id')
+    return None
+
+
+def lineup_players(lineup):
+    """Return [(name, player_id, position_id)] for a team's starting XI."""
+    starters = []
+    for _, row in lineup.iterrows():
+        position_id = _starting_position_id(row.get('positions'))
+        if position_id is not None:
+            starters.append((display_name(row), row['player_id'], position_id))
+    if not starters:
+        # Lineups without position spells: take the first eleven, goalkeeper first.
+        starters = [(display_name(row), row['player_id'], 1 if i == 0 else 14)
+                    for i, (_, row) in enumerate(lineup.head(11).iterrows())]
+    return starters
+
+
+def fit_match_model(shot_data):
+    """Fallback when no trained model is saved: fit on this match's shots (None if all one outcome)."""
+    from sklearn.linear_model import LogisticRegression
+
+    if shot_data['is_goal'].nunique() < 2:
+        return None
+    classifier = LogisticRegression().fit(shot_data[FEATURES].to_numpy(), shot_data['is_goal'])
+    return XGModel(classifier.intercept_[0], classifier.coef_[0], n_shots=len(shot_data))
+
+
+class MatchData:
+    """Everything the dashboard derives from one match: events, shots, team stats, squads and replay."""
+
+    def __init__(self, match_id, events, lineups, xg_model=None, stored_replay=None):
+        self.match_id = match_id
+        self.events = build_event_store(events)
+        self.teams = list(lineups)[:2]
+        self.sides = dict(zip(self.teams, ('left', 'right')))
+
+        # Players, roles and starting positions from the lineups; roster covers substitutes too
+        self.id_to_player, self.roster = {}, {}
+        for team in lineups:
+            for _, row in lineups[team].iterrows():
+                name = self.id_to_player[row['player_id']] = display_name(row)
+                position_id = _first_position_id(row.get('positions'))
+                role = None if position_id is None else POSITION_LAYOUT.get(position_id, ('MID', 40, 34))[0]
+                self.roster[name] = (team, role)
+        self.squads, self.player_team, self.player_roles, self.starting_locations = {}, {}, {}, {}
+        for team in self.teams:
+            self.squads[team] = []
+            for name, _, position_id in lineup_players(lineups[team]):
+                role, x, y = POSITION_LAYOUT.get(position_id, ('MID', 40, 34))
+                if self.sides[team] == 'right':
+                    x, y = _mirror(x, y)
+                self.squads[team].append(name)
+                self.player_team[name] = team
+                self.player_roles[name] = role
+                self.roster[name] = (team, role)
+                self.starting_locations[name] = (x, y)
+
+        # Shots, xG and team statistics
+        self.shot_data = shot_features(self.events)
+        model = xg_model or fit_match_model(self.shot_data)
+        if model is not None:
+            self.shot_data['xG_value'] = model.predict(self.shot_data[FEATURES].to_numpy())
+        else:
+            self.shot_data['xG_value'] = 0.0
+        attack = {}
+        for team in self.teams:
+            team_shots = self.events[(self.events['type'] == 'Shot') & (self.events['team'] == team)]
+            sb_x, sb_y = attack_target(model, team_shots) if model is not None else DEFAULT_ATTACK_TARGET
+            # StatsBomb always records the shooting team attacking towards x = 120.
+            x, y = to_pitch(sb_x, sb_y)
+            attack[team] = _mirror(x, y) if self.sides[team] == 'right' else (x, y)
+        # Target position per (team, role), looked up directly by tactical_advice
+        self.role_targets = {}
+        for team in self.teams:
+            own, opp = attack[team], attack[self.opponent(team)]
+            self.role_targets[(team, 'FWD')] = own
+            self.role_targets[(team, 'DEF')] = opp
+            self.role_targets[(team, 'MID')] = ((own[0] + opp[0]) / 2, (own[1] + opp[1]) / 2)
+            self.role_targets[(team, 'GK')] = (5, 34) if self.sides[team] == 'left' else (100, 34)
+        match_shots = self.shot_data[self.shot_data['period'] != SHOOTOUT_PERIOD]
+        team_xg = {team: match_shots.loc[match_shots['team'] == team, 'xG_value'].sum() for team in self.teams}
+        self.team_stats = pd.DataFrame({
+            'Squad': self.teams,
+            'Attack_xG': [team_xg[team] for team in self.teams],
+            'Defense_xG': [team_xg[self.opponent(team)] for team in self.teams],
+        })
+        self.team_stats['xG_balance'] = self.team_stats['Attack_xG'] - self.team_stats['Defense_xG']
+
+        # Whole-match replay, simulated once or read from batch output: (steps x players x 2)
+        self.player_names = list(self.starting_locations)
+        # StatsBomb has both teams attacking towards x = 120; the right-hand team's rows are mirrored.
+        self.mirrored = self.events['team'].isin([t for t in self.teams if self.sides[t] == 'right']).to_numpy()
+        stored = None if stored_replay is None else positions_from_frame(
+            stored_replay, self.player_names, len(self.events))
+        self.replay_positions = stored if stored is not None else build_replay(
+            self.events, self.id_to_player, self.player_names,
+            start_positions=[self.starting_locations[name] for name in self.player_names],
+            roles=[self.player_roles[name] for name in self.player_names],
+            bounds=[get_movement_bounds(self.player_roles[name], self.sides[self.player_team[name]])
+                    for name in self.player_names],
+            mirrored=self.mirrored)
+        self.timeline = Timeline(self.events)
+        self.key_events = self.timeline.key_events(self.events)
+        self.player_stats = PlayerStats(self.events, self.id_to_player, self.shot_data)
+        self._nbytes = int(self.events.memory_usage(deep=True).sum()
+                           + self.shot_data.memory_usage(deep=True).sum()
+                           + self.replay_positions.nbytes
+                           + self.player_stats.nbytes())
+
+    @property
+    def title(self):
+        return ' vs '.join(self.teams)
+
+    def opponent(self, team):
+        return self.teams[1] if team == self.teams[0] else self.teams[0]
+
+    def frame_at(self, step):
+        """Return the (players x 2) position array for a replay step."""
+        return self.replay_positions[step % len(self.replay_positions)]
+
+    def locations_at(self, step):
+        """Return {player: (x, y)} for a replay step from the precomputed timeline."""
+        return dict(zip(self.player_names, map(tuple, self.frame_at(step).tolist())))
+
+    def nbytes(self):
+        """Approximate resident size, used for the registry's memory budget.
+
+        Includes whatever the dashboard has attached since loading (ATTACHED), such as
+        precomputed pitch control, so the figure grows as those fill up.
+        """
+        attached = (getattr(self, name, None) for name in ATTACHED)
+        return self._nbytes + sum(part.nbytes() for part in attached if part is not None)
+
+
+class MatchRegistry:
+    """Loads matches on first request and keeps them in an LRU bounded by ``max_bytes``."""
+
+    def __init__(self, max_bytes=MEMORY_BUDGET_BYTES, loader=load_match, xg_model=None, analytics_dir=ANALYTICS_DIR):
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self.analytics_dir = analytics_dir
+        # Trained offline with `python xg_model.py ...`; loaded once, never fitted at startup.
+        self.xg_model = xg_model or load_model()
+        self._matches = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, match_id):
+        match_id = int(match_id)
+        with self._lock:
+            match = self._matches.get(match_id)
+            if match is not None:
+                self._matches.move_to_end(match_id)
+                return match
+            load_lock = self._loading.setdefault(match_id, threading.Lock())
+        # One thread builds a given match; others requesting it wait instead of duplicating the work.
+        with load_lock:
+            try:
+                with self._lock:
+                    match = self._matches.get(match_id)
+                if match is None:
+                    match = MatchData(match_id, *self.loader(match_id), xg_model=self.xg_model,
+                                      stored_replay=self._stored_replay(match_id))
+                    with self._lock:
+                        self._matches[match_id] = match
+                        self._evict(keep=match_id)
+            finally:
+                with self._lock:
+                    self._loading.pop(match_id, None)
+        return match
+
+    def _stored_replay(self, match_id):
+        path = os.path.join(self.analytics_dir or '', str(match_id), 'replay.parquet')
+        if not self.analytics_dir or not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    def _evict(self, keep):
+        total = sum(m.nbytes() for m in self._matches.values())
+        while total > self.max_bytes and len(self._matches) > 1:
+            match_id, match = next(iter(self._matches.items()))
+            if match_id == keep:
+                break
+            del self._matches[match_id]
+            total -= match.nbytes()
+
+    def peek(self, match_id):
+        """The match if it is loaded, else None; never loads and leaves the LRU order alone."""
+        with self._lock:
+            return self._matches.get(int(match_id))
+
+    def loaded(self):
+        return list(self._matches)
+
+    def available_matches(self):
+        """Return [(match_id, label)] for configured and cached matches."""
+        labels = {match_id: f"Match {match_id}" for match_id in MATCH_IDS}
+        for match_id, teams in cached_matches().items():
+            labels[match_id] = ' vs '.join(teams)
+        for match_id, match in list(self._matches.items()):
+            labels[match_id] = match.title
+        return sorted(labels.items())
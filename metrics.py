@@ -0,0 +1,212 @@
+"""Hot-path instrumentation: stage timers, tick counters, a Prometheus /metrics route and a tick profiler.
+
+Everything is a no-op when FIDASH_METRICS=0; when enabled each timed stage costs two
+perf_counter calls and a short locked update.
+"""
+import bisect
+import cProfile
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get('FIDASH_METRICS', '1').lower() not in ('0', 'false', 'no')
+PROFILE_DIR = os.environ.get('FIDASH_PROFILE_DIR', '.')
+# Profile this many ticks from startup (0 = only when requested via POST /metrics/profile?ticks=N).
+PROFILE_TICKS = int(os.environ.get('FIDASH_PROFILE_TICKS', 0))
+# Upper bound for POST /metrics/profile?ticks=N, which anyone who can reach the server may call.
+MAX_PROFILE_TICKS = 1000
+
+# Histogram bucket upper bounds, in seconds.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_NULL = nullcontext()
+_lock = threading.Lock()
+_histograms = {}
+_counters = defaultdict(float)
+_in_flight = set()
+# Callback time spent in the current request, so serialization can be split out of it.
+_request = threading.local()
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+def observe(callback, stage, seconds):
+    key = (callback, stage)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+
+@contextmanager
+def _timer(callback, stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe(callback, stage, elapsed)
+        if stage == 'total':
+            _request.callback_seconds = getattr(_request, 'callback_seconds', 0.0) + elapsed
+
+
+def timed(callback, stage='total'):
+    """Context manager timing one stage of a callback."""
+    return _timer(callback, stage) if ENABLED else _NULL
+
+
+def inc(name, amount=1):
+    if ENABLED:
+        with _lock:
+            _counters[name] += amount
+
+
+@contextmanager
+def _tick(session_id):
+    with _lock:
+        overlapping = session_id in _in_flight
+        _in_flight.add(session_id)
+        _counters['ticks_served_total'] += 1
+        if overlapping:
+            _counters['ticks_overlapping_total'] += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _in_flight.discard(session_id)
+
+
+def tick(session_id):
+    """Count a served tick, and an overlapping one if the session already has a tick in flight."""
+    return _tick(session_id) if ENABLED else _NULL
+
+
+# -------------------------
+# Tick profiler
+# -------------------------
+class TickProfiler:
+    """Profiles the next N ticks with cProfile and writes them to one .pstats file."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._remaining = 0
+        self._profile = None
+        self.last_path = None
+
+    def start(self, ticks):
+        with self._lock:
+            self._profile = cProfile.Profile()
+            self._remaining = ticks
+
+    @contextmanager
+    def _profiled(self):
+        # cProfile is per thread: profile one tick at a time and let concurrent ones run untraced.
+        if not self._lock.acquire(blocking=False):
+            yield
+            return
+        try:
+            if self._remaining <= 0:
+                yield
+                return
+            self._profile.enable()
+            try:
+                yield
+            finally:
+                self._profile.disable()
+                self._remaining -= 1
+                if self._remaining == 0:
+                    os.makedirs(PROFILE_DIR, exist_ok=True)
+                    self.last_path = os.path.join(PROFILE_DIR, f'fidash-profile-{int(time.time())}.pstats')
+                    self._profile.dump_stats(self.last_path)
+                    self._profile = None
+        finally:
+            self._lock.release()
+
+    def profiled(self):
+        return self._profiled() if self._remaining > 0 else _NULL
+
+
+profiler = TickProfiler()
+if PROFILE_TICKS:
+    profiler.start(PROFILE_TICKS)
+
+
+# -------------------------
+# Prometheus exposition
+# -------------------------
+def render(gauges=None):
+    """Render all metrics in the Prometheus text format."""
+    lines = []
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: (list(h.buckets), h.count, h.sum) for key, h in _histograms.items()}
+    for name in sorted(counters):
+        lines += [f'# TYPE fidash_{name} counter', f'fidash_{name} {counters[name]:g}']
+    for name, fn in sorted((gauges or {}).items()):
+        lines += [f'# TYPE fidash_{name} gauge', f'fidash_{name} {fn():g}']
+    if histograms:
+        lines.append('# TYPE fidash_stage_seconds histogram')
+    for (callback, stage), (buckets, count, total) in sorted(histograms.items()):
+        labels = f'callback="{callback}",stage="{stage}"'
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float('inf'),), buckets):
+            cumulative += n
+            le = '+Inf' if bound == float('inf') else f'{bound:g}'
+            lines.append(f'fidash_stage_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'fidash_stage_seconds_count{{{labels}}} {count}')
+        lines.append(f'fidash_stage_seconds_sum{{{labels}}} {total:.6f}')
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(server, gauges=None):
+    """Add /metrics and /metrics/profile routes and time Dash update requests on a Flask server."""
+    from flask import Response, g, jsonify, request
+
+    @server.route('/metrics')
+    def prometheus_metrics():
+        return Response(render(gauges), mimetype='text/plain; version=0.0.4')
+
+    @server.route('/metrics/profile', methods=['POST'])
+    def start_profile():
+        try:
+            ticks = int(request.args.get('ticks', 50))
+        except ValueError:
+            ticks = 0
+        if ticks < 1:
+            return jsonify({'error': 'ticks must be a positive integer'}), 400
+        ticks = min(ticks, MAX_PROFILE_TICKS)
+        profiler.start(ticks)
+        return jsonify({'profiling_ticks': ticks, 'output_dir': os.path.abspath(PROFILE_DIR),
+                        'last_profile': profiler.last_path})
+
+    if not ENABLED:
+        return
+
+    @server.before_request
+    def start_request_timer():
+        g.fidash_request_start = time.perf_counter()
+        _request.callback_seconds = 0.0
+
+    @server.after_request
+    def record_request(response):
+        start = g.pop('fidash_request_start', None)
+        if start is not None and request.path.endswith('_dash-update-component'):
+            elapsed = time.perf_counter() - start
+            observe('dash_update', 'request', elapsed)
+            # Whatever the timed callbacks did not account for is Dash's dispatch and JSON serialization.
+            observe('dash_update', 'serialization', max(elapsed - _request.callback_seconds, 0.0))
+            inc('response_bytes_total', response.calculate_content_length() or 0)
+        return response
@@ -0,0 +1,95 @@
+"""Pitch control: which team would reach each part of the pitch first, for every replay step."""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PITCH_LENGTH = 105
+PITCH_WIDTH = 68
+
+# Grid cell centres, in metres.
+GRID_STEP = 2.5
+GRID_X = np.arange(GRID_STEP / 2, PITCH_LENGTH, GRID_STEP)
+GRID_Y = np.arange(GRID_STEP / 2, PITCH_WIDTH, GRID_STEP)
+
+# A player's influence on a cell decays with the time to run there (distance / MAX_SPEED),
+# on a scale of TIME_SCALE seconds; a cell's control is the left team's share of influence.
+MAX_SPEED = 5.0
+TIME_SCALE = 0.45
+
+# Steps per vectorised batch, to keep the (steps x cells x players) arrays small.
+CHUNK_STEPS = 128
+
+
+def control_surface(frames, left):
+    """Left-team control in percent, shape (steps, len(GRID_Y), len(GRID_X)), as uint8.
+
+    ``frames`` is (steps, players, 2) and ``left`` a boolean mask of left-team players;
+    all steps, cells and players are evaluated in one broadcast expression.
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    gx, gy = np.meshgrid(GRID_X.astype(np.float32), GRID_Y.astype(np.float32))
+    cells = np.stack([gx.ravel(), gy.ravel()], axis=1)
+    distance = np.hypot(frames[:, None, :, 0] - cells[None, :, None, 0],
+                        frames[:, None, :, 1] - cells[None, :, None, 1])
+    # Relative to the closest player, so the exponent never underflows to 0 / 0.
+    time_to_cell = (distance - distance.min(axis=2, keepdims=True)) / MAX_SPEED
+    influence = np.exp(-time_to_cell / TIME_SCALE)
+    share = influence[:, :, left].sum(axis=2) / influence.sum(axis=2)
+    return np.rint(share * 100).astype(np.uint8).reshape(len(frames), len(GRID_Y), len(GRID_X))
+
+
+class PitchControl:
+    """Per-step control surfaces for a match, LRU-cached by step or precomputed for the whole replay."""
+
+    def __init__(self, match, cache_steps=256):
+        self.match = match
+        self.left = np.array([match.sides[match.player_team[name]] == 'left' for name in match.player_names])
+        self.cache_steps = cache_steps
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._all = None
+
+    def surface(self, step):
+        step = step % len(self.match.replay_positions)
+        if self._all is not None:
+            return self._all[step]
+        with self._lock:
+            cached = self._cache.get(step)
+            if cached is not None:
+                self._cache.move_to_end(step)
+                return cached
+        surface = control_surface(self.match.frame_at(step)[None], self.left)[0]
+        with self._lock:
+            self._cache[step] = surface
+            if len(self._cache) > self.cache_steps:
+                self._cache.popitem(last=False)
+        return surface
+
+    def surfaces(self, steps, workers=None):
+        """Surfaces for many steps, in batches spread over ``workers`` processes (1 = in this process)."""
+        if self._all is not None:
+            return self._all[steps]
+        positions = self.match.replay_positions[steps]
+        chunks = [positions[i:i + CHUNK_STEPS] for i in range(0, len(positions), CHUNK_STEPS)]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(chunks) == 1:
+            surfaces = [control_surface(chunk, self.left) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                surfaces = list(pool.map(control_surface, chunks, [self.left] * len(chunks)))
+        return np.concatenate(surfaces)
+
+    def precompute(self, workers=None):
+        """Compute and keep every step of the replay."""
+        self._all = self.surfaces(np.arange(len(self.match.replay_positions)), workers)
+        self._cache.clear()
+        return self._all
+
+    def nbytes(self):
+        if self._all is not None:
+            return self._all.nbytes
+        with self._lock:
+            return sum(surface.nbytes for surface in self._cache.values())
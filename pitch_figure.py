@@ -0,0 +1,97 @@
+"""Incremental pitch rendering: static markings sent once, then per-tick coordinate patches."""
+import json
+from functools import lru_cache
+
+import plotly.graph_objs as go
+from plotly.utils import PlotlyJSONEncoder
+
+try:
+    from dash import Patch
+except ImportError:  # Dash < 2.9
+    Patch = None
+
+PITCH_LENGTH = 105
+PITCH_WIDTH = 68
+
+# Pitch control sits first so it draws beneath the players.
+CONTROL_TRACE = 0
+PLAYERS_TRACE = 1
+ADVICE_TRACE = 2
+
+# Left team's share of control in percent: red (right team) through clear to blue (left team).
+CONTROL_COLORSCALE = [[0.0, 'rgba(220,40,40,0.6)'], [0.5, 'rgba(255,255,255,0)'], [1.0, 'rgba(40,80,220,0.6)']]
+
+# Player marker colour by the side of the pitch a team starts on.
+SIDE_COLORS = {'left': 'blue', 'right': 'red'}
+
+
+def player_colors(match):
+    """Marker colour for each of ``match.player_names``."""
+    return [SIDE_COLORS[match.sides[match.player_team[name]]] for name in match.player_names]
+
+
+@lru_cache(maxsize=1)
+def pitch_shapes():
+    """Pitch markings as layout shapes, so they never travel as trace data."""
+    line = dict(color="white", width=2)
+    goal = dict(color="white", width=4)
+    rects = [(0, 0, 105, 68), (0, 13.84, 16.5, 54.16), (88.5, 13.84, 105, 54.16),
+             (0, 24.84, 5.5, 43.16), (99.5, 24.84, 105, 43.16)]
+    shapes = [dict(type="rect", x0=x0, y0=y0, x1=x1, y1=y1, line=line, layer="below")
+              for x0, y0, x1, y1 in rects]
+    shapes.append(dict(type="line", x0=52.5, y0=0, x1=52.5, y1=68, line=dict(line, dash="dash"), layer="below"))
+    shapes.append(dict(type="circle", x0=52.5 - 9.15, y0=34 - 9.15, x1=52.5 + 9.15, y1=34 + 9.15,
+                       line=line, layer="below"))
+    shapes.append(dict(type="line", x0=0, y0=30.34, x1=0, y1=37.66, line=goal, layer="below"))
+    shapes.append(dict(type="line", x0=105, y0=30.34, x1=105, y1=37.66, line=goal, layer="below"))
+    return tuple(shapes)
+
+
+def pitch_layout():
+    return go.Layout(
+        xaxis=dict(range=[0, PITCH_LENGTH], showgrid=False, zeroline=True, visible=False),
+        yaxis=dict(range=[0, PITCH_WIDTH], showgrid=False, zeroline=True, visible=False),
+        plot_bgcolor="green", height=500, margin=dict(l=20, r=20, t=20, b=20),
+        title=".", shapes=list(pitch_shapes()), showlegend=False,
+        uirevision="pitch"
+    )
+
+
+def control_trace(grid_x, grid_y, surface=None):
+    """Heatmap of pitch control; empty (invisible) when ``surface`` is None."""
+    return go.Heatmap(x=list(grid_x), y=list(grid_y), z=[] if surface is None else surface.tolist(),
+                      zmin=0, zmax=100, zsmooth='best', colorscale=CONTROL_COLORSCALE,
+                      showscale=False, hoverinfo='skip')
+
+
+def base_figure(player_names, colors, frame, grid_x=(), grid_y=(), control=None):
+    """Initial figure: a control heatmap, one 22-point player trace and an (empty) advice overlay trace."""
+    players = go.Scatter(
+        x=frame[:, 0].round(2).tolist(), y=frame[:, 1].round(2).tolist(),
+        mode="markers+text", text=list(player_names), textposition="top center",
+        marker=dict(size=12, color=list(colors), line=dict(width=2, color='black')),
+        customdata=list(player_names),
+        hovertemplate="<b>%{customdata}</b><br>x: %{x:.2f}, y: %{y:.2f}<extra></extra>"
+    )
+    advice = go.Scatter(x=[], y=[], mode="lines+markers", hoverinfo="skip",
+                        line=dict(color="yellow", width=2, dash="dash"),
+                        marker=dict(size=8, color="yellow"))
+    return go.Figure(data=[control_trace(grid_x, grid_y, control), players, advice], layout=pitch_layout())
+
+
+def frame_patch(frame, advice_xs=(), advice_ys=(), control=None):
+    """Patch carrying only this tick's player coordinates, advice lines and (if shown) control surface."""
+    patch = Patch()
+    patch['data'][CONTROL_TRACE]['z'] = [] if control is None else control.tolist()
+    patch['data'][PLAYERS_TRACE]['x'] = frame[:, 0].round(2).tolist()
+    patch['data'][PLAYERS_TRACE]['y'] = frame[:, 1].round(2).tolist()
+    patch['data'][ADVICE_TRACE]['x'] = list(advice_xs)
+    patch['data'][ADVICE_TRACE]['y'] = list(advice_ys)
+    return patch
+
+
+def payload_bytes(response):
+    """Size of a callback response (figure or Patch) as Dash would serialize it."""
+    if hasattr(response, 'to_plotly_json'):
+        response = response.to_plotly_json()
+    return len(json.dumps(response, cls=PlotlyJSONEncoder).encode('utf-8'))
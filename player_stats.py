@@ -0,0 +1,60 @@
+"""Per-player match statistics from the events, as running totals that can be read at any replay step."""
+import numpy as np
+
+from event_store import SHOOTOUT_PERIOD
+
+METRICS = ['shots', 'goals', 'xg', 'assists', 'passes', 'passes_completed', 'touches']
+
+# Event types where the player has the ball; Pressure, Duel, Block and the like have a
+# location but are not touches.
+ON_BALL_TYPES = ['Pass', 'Ball Receipt*', 'Carry', 'Dribble', 'Shot', 'Ball Recovery', 'Clearance',
+                 'Interception', 'Miscontrol', 'Goal Keeper', 'Shield']
+
+
+class PlayerStats:
+    """Cumulative totals of shape (steps, players, metrics): row ``s`` counts events 0..s.
+
+    Built with one scatter per metric (each event has a single actor) and a cumulative
+    sum, so reading a player's stats as of any step is a single array lookup.
+    """
+
+    def __init__(self, events, id_to_player, shot_data):
+        self.player_names = list(dict.fromkeys(id_to_player.values()))
+        self.index_of = {name: i for i, name in enumerate(self.player_names)}
+        id_to_index = {pid: self.index_of[name] for pid, name in id_to_player.items()}
+        n_steps = len(events)
+
+        player = events['player_id'].map(id_to_index).fillna(-1).to_numpy(np.int64)
+        kind = events['type'].to_numpy()
+        is_pass = kind == 'Pass'
+        is_shot = (kind == 'Shot') & (events['period'].to_numpy() != SHOOTOUT_PERIOD)
+        xg = np.zeros(n_steps)
+        xg[shot_data.index.to_numpy()] = shot_data['xG_value'].to_numpy()
+        xg[~is_shot] = 0
+        assist = events['pass_goal_assist'].to_numpy(bool) if 'pass_goal_assist' in events else np.zeros(n_steps, bool)
+        increments = {
+            'shots': is_shot,
+            'goals': is_shot & (events['shot_outcome'] == 'Goal').to_numpy(),
+            'xg': xg,
+            'assists': is_pass & assist,
+            'passes': is_pass,
+            'passes_completed': is_pass & events['pass_outcome'].isna().to_numpy(),
+            'touches': np.isin(kind, ON_BALL_TYPES),
+        }
+
+        totals = np.zeros((n_steps, len(self.player_names), len(METRICS)), dtype=np.float32)
+        steps = np.flatnonzero(player >= 0)
+        for m, metric in enumerate(METRICS):
+            totals[steps, player[steps], m] = increments[metric][steps]
+        self.totals = np.cumsum(totals, axis=0, out=totals)
+
+    def as_of(self, step, player_name):
+        """{metric: value} for a player after event ``step``; zeros for unknown players."""
+        i = self.index_of.get(player_name)
+        if i is None or not len(self.totals):
+            return dict.fromkeys(METRICS, 0)
+        row = self.totals[step % len(self.totals), i].tolist()
+        return {metric: value if metric == 'xg' else int(value) for metric, value in zip(METRICS, row)}
+
+    def nbytes(self):
+        return self.totals.nbytes
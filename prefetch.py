@@ -0,0 +1,106 @@
+"""Response caching for callbacks: a bounded LRU and a look-ahead renderer for upcoming replay frames."""
+import os
+import threading
+from collections import OrderedDict, deque
+
+LOOKAHEAD_FRAMES = int(os.environ.get('FIDASH_LOOKAHEAD_FRAMES', 8))
+FRAME_BUFFER_SIZE = int(os.environ.get('FIDASH_FRAME_BUFFER', 512))
+RESPONSE_CACHE_SIZE = int(os.environ.get('FIDASH_RESPONSE_CACHE', 1024))
+# Sessions with a look-ahead queued at once; the least recently scheduled is dropped beyond this.
+MAX_PLANS = 256
+
+
+class LRUCache:
+    """Thread-safe mapping that drops the least recently used entry beyond ``max_entries``."""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FramePrefetcher:
+    """Renders frames ahead of playback on a background thread into a fixed-size buffer.
+
+    ``render(key)`` builds the response for a key (None skips it); ticks take it from
+    the buffer with ``get`` and hand over the frames they will need next with ``schedule``.
+    Only each session's latest look-ahead is kept, so frames playback has already passed
+    are dropped rather than rendered, and sessions take turns one frame at a time. The
+    buffer overwrites its oldest frames first, like a ring.
+    """
+
+    def __init__(self, render, depth=LOOKAHEAD_FRAMES, size=FRAME_BUFFER_SIZE, max_plans=MAX_PLANS):
+        self.render = render
+        self.depth = depth
+        self.max_plans = max_plans
+        self.buffer = LRUCache(size)
+        self._plans = OrderedDict()
+        self._wake = threading.Condition()
+        self._thread = None
+
+    def get(self, key):
+        return self.buffer.get(key)
+
+    def schedule(self, session_id, keys):
+        """Replace a session's look-ahead with ``keys``, nearest first; buffered keys are skipped."""
+        if not self.depth:
+            return
+        with self._wake:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='fidash-prefetch', daemon=True)
+                self._thread.start()
+            self._plans[session_id] = deque(key for key in keys if key not in self.buffer)
+            self._plans.move_to_end(session_id)
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+            self._wake.notify()
+
+    def pending(self):
+        """Keys still waiting to be rendered, across all sessions."""
+        with self._wake:
+            return sum(len(plan) for plan in self._plans.values())
+
+    def _next(self):
+        """Next key in round-robin order over sessions, waiting while there is none."""
+        with self._wake:
+            while True:
+                while self._plans:
+                    session_id, plan = next(iter(self._plans.items()))
+                    key = plan.popleft() if plan else None
+                    if plan:
+                        self._plans.move_to_end(session_id)
+                    else:
+                        del self._plans[session_id]
+                    if key is not None and key not in self.buffer:
+                        return key
+                self._wake.wait()
+
+    def _run(self):
+        while True:
+            key = self._next()
+            try:
+                response = self.render(key)
+                if response is not None:
+                    self.buffer.put(key, response)
+            except Exception:  # the tick renders it synchronously instead
+                pass
@@ -0,0 +1,95 @@
+"""Precomputed replay timeline: every player's position at every event step."""
+import numpy as np
+import pandas as pd
+
+TRANSITION_RATE = 0.3
+DYNAMIC_MOVE_PROB = 0.2
+REPLAY_SEED = 2022
+PITCH_LENGTH = 105
+PITCH_WIDTH = 68
+
+
+def event_targets(events, id_to_player, player_names, mirrored=None):
+    """Per-event actor/recipient player indices (-1 for none) and their destinations.
+
+    ``events`` is an event store (see event_store.build_event_store). StatsBomb records
+    every team attacking towards x = 120, so rows flagged in ``mirrored`` (the team drawn
+    on the right) are turned round onto the drawn pitch.
+    """
+    index_of = {name: i for i, name in enumerate(player_names)}
+    id_to_index = {pid: index_of[name] for pid, name in id_to_player.items() if name in index_of}
+
+    def to_index(ids):
+        return pd.Series(ids).map(id_to_index).fillna(-1).to_numpy(np.int16)
+
+    scale = np.array([PITCH_LENGTH / 120, PITCH_WIDTH / 80])
+    actor = to_index(events['player_id'])
+    actor_dest = events[['x', 'y']].to_numpy(np.float64) * scale
+    actor[np.isnan(actor_dest).any(axis=1)] = -1
+
+    recipient = to_index(events['pass_recipient_id'])
+    recipient_dest = events[['end_x', 'end_y']].to_numpy(np.float64) * scale
+    recipient[(events['type'] != 'Pass').to_numpy() | np.isnan(recipient_dest).any(axis=1)] = -1
+    if mirrored is not None:
+        size = np.array([PITCH_LENGTH, PITCH_WIDTH])
+        actor_dest[mirrored] = size - actor_dest[mirrored]
+        recipient_dest[mirrored] = size - recipient_dest[mirrored]
+    return actor, actor_dest, recipient, recipient_dest
+
+
+def replay_frame(positions, player_names):
+    """Long (step, player, x, y) table of a replay, the layout the batch pipeline stores."""
+    n_steps, n_players = positions.shape[:2]
+    return pd.DataFrame({
+        'step': np.repeat(np.arange(n_steps, dtype=np.int32), n_players),
+        'player': np.tile(np.asarray(player_names, dtype=object), n_steps),
+        'x': positions[:, :, 0].ravel(),
+        'y': positions[:, :, 1].ravel(),
+    })
+
+
+def positions_from_frame(frame, player_names, n_steps):
+    """Inverse of replay_frame; None when the stored replay is for other players or events."""
+    if len(frame) != n_steps * len(player_names):
+        return None
+    stored = frame['player'].iloc[:len(player_names)].astype(str).tolist()
+    if stored != list(player_names):
+        return None
+    return frame[['x', 'y']].to_numpy(np.float64).reshape(n_steps, len(player_names), 2)
+
+
+def build_replay(match_events, id_to_player, player_names, start_positions, roles, bounds, seed=REPLAY_SEED,
+                 mirrored=None):
+    """Simulate the whole match once and return positions of shape (steps, players, 2).
+
+    Frame ``s`` is the state after event ``s`` is applied, using the same rules the
+    per-tick update used: the event's player (and pass recipient) glide towards the
+    event location, everyone else jitters within their role's movement bounds.
+    """
+    actor, actor_dest, recipient, recipient_dest = event_targets(match_events, id_to_player, player_names, mirrored)
+    n_steps, n_players = len(match_events), len(player_names)
+
+    rng = np.random.default_rng(seed)
+    is_gk = np.array([role == 'GK' for role in roles])
+    dynamic = (rng.random((n_steps, n_players)) < DYNAMIC_MOVE_PROB) & ~is_gk
+    small_scale = np.where(is_gk, 0.2, 0.5)[:, None]
+    jitter = np.where(dynamic[:, :, None],
+                      rng.uniform(-2.0, 2.0, (n_steps, n_players, 2)),
+                      rng.uniform(-1.0, 1.0, (n_steps, n_players, 2)) * small_scale)
+    jitter *= TRANSITION_RATE
+
+    bounds = np.asarray(bounds, dtype=float)
+    low, high = bounds[:, [0, 2]], bounds[:, [1, 3]]
+
+    positions = np.empty((n_steps, n_players, 2))
+    pos = np.asarray(start_positions, dtype=float).copy()
+    for step in range(n_steps):
+        new = np.clip(pos + jitter[step], low, high)
+        a, r = actor[step], recipient[step]
+        if a >= 0:
+            new[a] = pos[a] + TRANSITION_RATE * (actor_dest[step] - pos[a])
+        if r >= 0:
+            curr = new[r] if r == a else pos[r]
+            new[r] = curr + TRANSITION_RATE * (recipient_dest[step] - curr)
+        positions[step] = pos = new
+    return positions
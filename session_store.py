@@ -0,0 +1,108 @@
+"""Per-session replay state, bounded and evicted least-recently-used first."""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_SESSIONS = 1000
+
+
+def new_session_state():
+    return {'match_id': None, 'step': 0, 'tick': None, 'selected_player': None}
+
+
+class LRUSessionStore:
+    """In-process store; each worker keeps its own sessions."""
+
+    def __init__(self, max_sessions=DEFAULT_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                return new_session_state()
+            self._sessions.move_to_end(session_id)
+            return dict(state)
+
+    def set(self, session_id, state):
+        with self._lock:
+            self._sessions[session_id] = dict(state)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class FileSessionStore:
+    """Store shared by every worker on a host: one small JSON file per session.
+
+    Point ``directory`` at a tmpfs such as /dev/shm to keep it in shared memory.
+    Eviction removes the least recently touched files once ``max_sessions`` is exceeded.
+    """
+
+    def __init__(self, directory, max_sessions=DEFAULT_MAX_SESSIONS):
+        self.directory = directory
+        self.max_sessions = max_sessions
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, session_id):
+        safe_id = ''.join(c for c in str(session_id) if c.isalnum() or c == '-')
+        return os.path.join(self.directory, f'{safe_id}.json')
+
+    def get(self, session_id):
+        path = self._path(session_id)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return new_session_state()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return state
+
+    def set(self, session_id, state):
+        path = self._path(session_id)
+        # Per thread as well as per process: overlapping ticks of one session write concurrently.
+        tmp_path = f'{path}.{os.getpid()}-{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        # Evict occasionally rather than listing the directory on every tick.
+        self._writes += 1
+        if self._writes % 50 == 0:
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                try:
+                    entries.append((os.path.getmtime(os.path.join(self.directory, name)), name))
+                except OSError:
+                    continue
+        entries.sort()
+        for _, name in entries[:max(0, len(entries) - self.max_sessions)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith('.json'))
+
+
+def make_session_store():
+    """Build the store named by FIDASH_SESSION_STORE ('memory' or 'file:<dir>')."""
+    spec = os.environ.get('FIDASH_SESSION_STORE', 'memory')
+    max_sessions = int(os.environ.get('FIDASH_MAX_SESSIONS', DEFAULT_MAX_SESSIONS))
+    if spec.startswith('file:'):
+        return FileSessionStore(spec[len('file:'):], max_sessions)
+    return LRUSessionStore(max_sessions)
@@ -0,0 +1,170 @@
+"""Spatial index over event locations and pass end points, for region and player queries in pitch metres."""
+import numpy as np
+import pandas as pd
+
+from event_store import PITCH_LENGTH, PITCH_WIDTH, to_pitch
+
+# Grid cells of CELL_SIZE metres, numbered row by row; points are stored sorted by cell,
+# so the cells a rectangle overlaps in one grid row are one contiguous slice.
+CELL_SIZE = 5.0
+N_COLS = int(np.ceil(PITCH_LENGTH / CELL_SIZE))
+N_ROWS = int(np.ceil(PITCH_WIDTH / CELL_SIZE))
+
+# Which coordinates a query looks at: where the event happened, or where a pass ended.
+POINTS = ('location', 'pass_end')
+
+
+def _col(x):
+    return np.clip(np.floor_divide(x, CELL_SIZE), 0, N_COLS - 1).astype(np.int64)
+
+
+def _row(y):
+    return np.clip(np.floor_divide(y, CELL_SIZE), 0, N_ROWS - 1).astype(np.int64)
+
+
+def points_in_polygon(x, y, poly_x, poly_y):
+    """Even-odd rule for many points against one polygon, one vectorised pass per edge."""
+    inside = np.zeros(len(x), dtype=bool)
+    x0, y0 = poly_x[-1], poly_y[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for x1, y1 in zip(poly_x, poly_y):
+            crosses = (y1 > y) != (y0 > y)
+            inside ^= crosses & (x < x1 + (y - y1) * (x0 - x1) / (y0 - y1))
+            x0, y0 = x1, y1
+    return inside
+
+
+class GridIndex:
+    """Points bucketed into the pitch grid; queries return the ``ids`` of the points inside."""
+
+    def __init__(self, x, y, ids):
+        keep = ~(np.isnan(x) | np.isnan(y))
+        x, y, ids = x[keep], y[keep], ids[keep]
+        cells = _row(y) * N_COLS + _col(x)
+        order = np.argsort(cells, kind='stable')
+        self.x, self.y, self.ids = x[order], y[order], ids[order]
+        # Points of cell c are [offsets[c], offsets[c + 1]).
+        self.offsets = np.searchsorted(cells[order], np.arange(N_ROWS * N_COLS + 1))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def nbytes(self):
+        return self.x.nbytes + self.y.nbytes + self.ids.nbytes + self.offsets.nbytes
+
+    def _candidates(self, x0, x1, y0, y1):
+        """Positions of the points in every cell the rectangle touches (a superset of the hits)."""
+        c0, c1 = int(_col(x0)), int(_col(x1))
+        slices = [np.arange(self.offsets[r * N_COLS + c0], self.offsets[r * N_COLS + c1 + 1])
+                  for r in range(int(_row(y0)), int(_row(y1)) + 1)]
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def rect(self, x0, x1, y0, y1):
+        x0, x1 = sorted((x0, x1))
+        y0, y1 = sorted((y0, y1))
+        i = self._candidates(x0, x1, y0, y1)
+        x, y = self.x[i], self.y[i]
+        return np.sort(self.ids[i[(x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)]])
+
+    def radius(self, x, y, r):
+        i = self._candidates(x - r, x + r, y - r, y + r)
+        return np.sort(self.ids[i[np.hypot(self.x[i] - x, self.y[i] - y) <= r]])
+
+    def lasso(self, poly_x, poly_y):
+        poly_x, poly_y = np.asarray(poly_x, dtype=float), np.asarray(poly_y, dtype=float)
+        if len(poly_x) < 3:
+            return np.empty(0, dtype=self.ids.dtype)
+        i = self._candidates(poly_x.min(), poly_x.max(), poly_y.min(), poly_y.max())
+        return np.sort(self.ids[i[points_in_polygon(self.x[i], self.y[i], poly_x, poly_y)]])
+
+
+class EventIndex:
+    """Grid indexes of event locations and pass end points, partitioned by player and team.
+
+    Coordinates are pitch metres. ``flip`` marks rows to mirror (the right-hand team of
+    a match) so queries line up with the drawn pitch; without it every team attacks
+    towards x = 105, as StatsBomb records them. Query results are row positions in
+    ``events``; pass them to ``frame`` for a table.
+    """
+
+    def __init__(self, events, id_to_player, flip=None):
+        self.events = events
+        self.id_to_player = id_to_player
+        coords = {}
+        for points, (x_name, y_name) in zip(POINTS, (('x', 'y'), ('end_x', 'end_y'))):
+            x, y = to_pitch(events[x_name].to_numpy(np.float64), events[y_name].to_numpy(np.float64))
+            if flip is not None:
+                x, y = np.where(flip, PITCH_LENGTH - x, x), np.where(flip, PITCH_WIDTH - y, y)
+            coords[points] = x, y
+        self.coords = coords
+        self.player_id = events['player_id'].to_numpy(np.int64)
+        teams = pd.Categorical(events['team'])
+        self.team_code = teams.codes
+        self.team_names = list(teams.categories)
+        self.kind = events['type'].astype(str).to_numpy()
+        self.player_ids = {}
+        for player_id, name in id_to_player.items():
+            self.player_ids.setdefault(name, []).append(player_id)
+        self._grids = {}
+
+    @classmethod
+    def for_match(cls, match):
+        return cls(match.events, match.id_to_player, flip=match.mirrored)
+
+    @classmethod
+    def for_matches(cls, matches):
+        """One index over the events of many matches (with a match_id column), in attacking direction."""
+        events = pd.concat([match.events.assign(match_id=match.match_id) for match in matches], ignore_index=True)
+        id_to_player = {}
+        for match in matches:
+            id_to_player.update(match.id_to_player)
+        return cls(events, id_to_player)
+
+    def grid(self, points='location', player=None, team=None):
+        """Grid over all events, or one player's or team's, built on first use."""
+        key = (points, player, team)
+        grid = self._grids.get(key)
+        if grid is None:
+            mask = np.ones(len(self.events), dtype=bool)
+            if player is not None:
+                mask &= np.isin(self.player_id, self.player_ids.get(player, []))
+            if team is not None:
+                mask &= self.team_code == (self.team_names.index(team) if team in self.team_names else -2)
+            ids = np.flatnonzero(mask)
+            x, y = self.coords[points]
+            grid = self._grids[key] = GridIndex(x[ids], y[ids], ids)
+        return grid
+
+    def _filter(self, rows, types):
+        return rows if types is None else rows[np.isin(self.kind[rows], list(types))]
+
+    def rect(self, x0, x1, y0, y1, points='location', player=None, team=None, types=None):
+        return self._filter(self.grid(points, player, team).rect(x0, x1, y0, y1), types)
+
+    def radius(self, x, y, r, points='location', player=None, team=None, types=None):
+        return self._filter(self.grid(points, player, team).radius(x, y, r), types)
+
+    def lasso(self, xs, ys, points='location', player=None, team=None, types=None):
+        return self._filter(self.grid(points, player, team).lasso(xs, ys), types)
+
+    def select(self, selected_data, points='location', player=None, team=None, types=None):
+        """Rows inside a Plotly box or lasso selection (a graph's ``selectedData``)."""
+        if selected_data and selected_data.get('lassoPoints'):
+            lasso = selected_data['lassoPoints']
+            return self.lasso(lasso['x'], lasso['y'], points, player, team, types)
+        if selected_data and selected_data.get('range'):
+            box = selected_data['range']
+            return self.rect(*box['x'], *box['y'], points, player, team, types)
+        return np.empty(0, dtype=np.int64)
+
+    def nbytes(self):
+        """Coordinates, partition columns and the grids built so far (``events`` is shared)."""
+        coords = sum(x.nbytes + y.nbytes for x, y in self.coords.values())
+        grids = sum(grid.nbytes() for grid in list(self._grids.values()))
+        return coords + self.player_id.nbytes + self.team_code.nbytes + self.kind.nbytes + grids
+
+    def frame(self, rows, points='location'):
+        """Events at ``rows`` with player names and the queried coordinates in metres."""
+        x, y = self.coords[points]
+        return self.events.iloc[rows].assign(player_name=self.events['player_id'].iloc[rows].map(self.id_to_player),
+                                             pitch_x=x[rows], pitch_y=y[rows])
@@ -0,0 +1,68 @@
+"""Match clock index over the replay steps: seek by time, slider marks and key events."""
+import numpy as np
+
+PERIOD_NAMES = {1: '1st half', 2: '2nd half', 3: 'Extra time 1', 4: 'Extra time 2', 5: 'Penalties'}
+MARK_EVERY_MINUTES = 15
+
+
+class Timeline:
+    """Maps match time (period, minute, second) to replay steps and back.
+
+    A step is an event index, and every step's positions are already in the replay
+    timeline, so a seek is one binary search plus a direct frame lookup however far
+    into the match the target is.
+    """
+
+    def __init__(self, events):
+        self.n_steps = len(events)
+        self.period = events['period'].to_numpy(np.int64)
+        self.minute = events['minute'].to_numpy(np.int64)
+        self.second = events['second'].to_numpy(np.int64)
+        clock = self.minute * 60 + self.second
+        # Steps of each period are contiguous (build_event_store sorts rows); a running max keeps the clock sorted within a
+        # period even when StatsBomb logs an event a second out of order.
+        self.periods = sorted(int(p) for p in np.unique(self.period))
+        self.bounds = {}
+        self._clock = np.empty(self.n_steps, dtype=np.int64)
+        for p in self.periods:
+            steps = np.flatnonzero(self.period == p)
+            lo, hi = int(steps[0]), int(steps[-1]) + 1
+            self.bounds[p] = (lo, hi)
+            self._clock[lo:hi] = np.maximum.accumulate(clock[lo:hi])
+        self._period_starts = np.array([self._clock[self.bounds[p][0]] for p in self.periods])
+
+    def seek(self, minute, second=0, period=None):
+        """Return the first step at or after ``minute:second`` (of ``period``, if given)."""
+        if not self.n_steps:
+            return 0
+        target = int(minute) * 60 + int(second)
+        if period is None:
+            # The match clock runs on across periods, so pick the latest period started by then.
+            index = max(int(np.searchsorted(self._period_starts, target, side='right')) - 1, 0)
+            period = self.periods[index]
+        lo, hi = self.bounds[period]
+        return min(lo + int(np.searchsorted(self._clock[lo:hi], target)), hi - 1)
+
+    def clock(self, step):
+        """Match clock label, e.g. "67:12", for a step."""
+        step = step % self.n_steps
+        return f"{self.minute[step]}:{self.second[step]:02d}"
+
+    def marks(self, every=MARK_EVERY_MINUTES):
+        """Slider marks {step: "15'"} every ``every`` minutes of match time."""
+        marks = {}
+        last_minute = int(self.minute.max()) if self.n_steps else 0
+        for minute in range(0, last_minute + 1, every):
+            marks.setdefault(self.seek(minute), f"{minute}'")
+        return marks
+
+    def key_events(self, events):
+        """[(step, label)] for period kick-offs and goals, in match order."""
+        key = [(lo, PERIOD_NAMES.get(p, f"Period {p}")) for p, (lo, _) in self.bounds.items()]
+        goal = ((events['type'] == 'Shot') & (events['shot_outcome'] == 'Goal')).to_numpy()
+        own_goal = (events['type'] == 'Own Goal For').to_numpy()
+        teams = events['team'].astype(object).to_numpy()
+        for step in np.flatnonzero(goal | own_goal):
+            suffix = ' (OG)' if own_goal[step] else ''
+            key.append((int(step), f"Goal {self.minute[step]}' {teams[step]}{suffix}"))
+        return sorted(key)
@@ -0,0 +1,124 @@
+"""Persisted xG model: trained offline on many matches, scored at startup with plain NumPy."""
+import json
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from event_store import build_event_store, shot_features, shot_geometry
+from match_cache import DEFAULT_CACHE_DIR, cached_matches, load_match
+
+MODEL_VERSION = 1
+FEATURES = ['shot_distance', 'shot_angle']
+DEFAULT_MODEL_PATH = os.environ.get('FIDASH_XG_MODEL', os.path.join(DEFAULT_CACHE_DIR, 'xg_model.json'))
+
+# Attacking-half grid (StatsBomb units) the xG surface is evaluated on.
+GRID_X = np.arange(60.0, 120.5, 1.0)
+GRID_Y = np.arange(0.0, 80.5, 1.0)
+
+# StatsBomb x range searched for a team's attacking target (edge of six-yard box to edge of the area).
+ATTACK_ZONE = (102.0, 114.0)
+
+
+class XGModel:
+    """Logistic xG model over shot distance and angle, evaluated without sklearn."""
+
+    def __init__(self, intercept, coef, trained_on=(), n_shots=0):
+        self.intercept = float(intercept)
+        self.coef = np.asarray(coef, dtype=float)
+        self.trained_on = list(trained_on)
+        self.n_shots = n_shots
+
+    def predict(self, features):
+        """Goal probability for an (n, 2) array of [distance, angle] rows."""
+        return 1.0 / (1.0 + np.exp(-(np.asarray(features, dtype=float) @ self.coef + self.intercept)))
+
+    def to_dict(self):
+        return {'version': MODEL_VERSION, 'features': FEATURES, 'intercept': self.intercept,
+                'coef': self.coef.tolist(), 'trained_on': self.trained_on, 'n_shots': self.n_shots}
+
+
+def train(match_ids, loader=load_match):
+    """Fit one model on the shots of every given match."""
+    from sklearn.linear_model import LogisticRegression
+
+    shots = [shot_features(build_event_store(loader(match_id)[0])) for match_id in match_ids]
+    features = np.vstack([s[FEATURES].to_numpy() for s in shots])
+    target = np.concatenate([s['is_goal'].to_numpy() for s in shots])
+    classifier = LogisticRegression().fit(features, target)
+    return XGModel(classifier.intercept_[0], classifier.coef_[0], match_ids, len(target))
+
+
+def save_model(model, path=DEFAULT_MODEL_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(model.to_dict(), f, indent=2)
+
+
+def load_model(path=DEFAULT_MODEL_PATH):
+    """Return the saved model, or None when none has been trained (or the format changed)."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != MODEL_VERSION or data.get('features') != FEATURES:
+        return None
+    return XGModel(data['intercept'], data['coef'], data.get('trained_on', ()), data.get('n_shots', 0))
+
+
+# -------------------------
+# xG surface and attacking targets
+# -------------------------
+@lru_cache(maxsize=4)
+def xg_surface(model):
+    """xG for every grid cell, scored in one batched call: shape (len(GRID_Y), len(GRID_X))."""
+    gx, gy = np.meshgrid(GRID_X, GRID_Y)
+    distance, angle = shot_geometry(gx, gy)
+    features = np.column_stack([distance.ravel(), angle.ravel()])
+    return model.predict(features).reshape(gx.shape)
+
+
+def _smooth(grid, sigma=4.0):
+    radius = int(3 * sigma)
+    kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+    kernel /= kernel.sum()
+    grid = np.apply_along_axis(np.convolve, 0, grid, kernel, mode='same')
+    return np.apply_along_axis(np.convolve, 1, grid, kernel, mode='same')
+
+
+def attack_target(model, team_shots):
+    """Best attacking (x, y) in StatsBomb units for a team shooting towards x = 120.
+
+    The xG surface is weighted by a smoothed density of the team's own shot
+    locations, so the target reflects where that team actually gets chances.
+    """
+    surface = xg_surface(model)
+    weights = np.ones_like(surface)
+    if len(team_shots):
+        density, _, _ = np.histogram2d(team_shots['y'], team_shots['x'], bins=[
+            np.append(GRID_Y - 0.5, GRID_Y[-1] + 0.5), np.append(GRID_X - 0.5, GRID_X[-1] + 0.5)])
+        density = _smooth(density)
+        if density.max() > 0:
+            weights = 0.25 + density / density.max()
+    columns = (GRID_X >= ATTACK_ZONE[0]) & (GRID_X <= ATTACK_ZONE[1])
+    zone = (surface * weights)[:, columns]
+    row, col = np.unravel_index(np.argmax(zone), zone.shape)
+    return float(GRID_X[columns][col]), float(GRID_Y[row])
+
+
+if __name__ == '__main__':
+    # Usage: python xg_model.py MATCH_ID [MATCH_ID ...] [--out PATH]
+    #        python xg_model.py --cached [--out PATH]   (every match in the local cache)
+    args = sys.argv[1:]
+    out = DEFAULT_MODEL_PATH
+    if '--out' in args:
+        out = args[args.index('--out') + 1]
+        del args[args.index('--out'):args.index('--out') + 2]
+    ids = sorted(cached_matches()) if args == ['--cached'] else [int(a) for a in args]
+    if not ids:
+        sys.exit("No matches given.")
+    trained = train(ids)
+    save_model(trained, out)
+    print(f"Trained on {trained.n_shots} shots from {len(ids)} matches -> {out}")